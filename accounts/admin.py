@@ -29,6 +29,9 @@ class UserAdmin(BaseUserAdmin):
             'fields': ('email', 'full_name', 'password1', 'password2', 'is_staff', 'is_active'),
         }),
     )
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('profile')
 
 
 @admin.register(Profile)
@@ -36,3 +39,6 @@ class ProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'newsletter_subscribed', 'created_at')
     list_filter = ('newsletter_subscribed',)
     search_fields = ('user__email', 'user__full_name')
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user')
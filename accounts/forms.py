@@ -1,3 +1,5 @@
+import re
+
 from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import AuthenticationForm
@@ -5,27 +7,37 @@ from django.core.exceptions import ValidationError
 
 User = get_user_model()
 
+_DIGIT_RE = re.compile(r'\d')
+
+# Shared Tailwind widget styling
+TAILWIND_INPUT_ATTRS = {
+    'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-transparent outline-none transition',
+}
+TAILWIND_CHECKBOX_ATTRS = {
+    'class': 'w-4 h-4 text-indigo-600 border-gray-300 rounded focus:ring-indigo-500',
+}
+
 
 class UserRegistrationForm(forms.ModelForm):
     """Form for user registration with email and password."""
     
     email = forms.EmailField(
         widget=forms.EmailInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-transparent outline-none transition',
+            **TAILWIND_INPUT_ATTRS,
             'placeholder': 'john@example.com',
         })
     )
     full_name = forms.CharField(
         max_length=255,
         widget=forms.TextInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-transparent outline-none transition',
+            **TAILWIND_INPUT_ATTRS,
             'placeholder': 'John Doe',
         })
     )
     password1 = forms.CharField(
         label='Password',
         widget=forms.PasswordInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-transparent outline-none transition',
+            **TAILWIND_INPUT_ATTRS,
             'placeholder': '••••••••',
         }),
         help_text='At least 8 characters with a number'
@@ -33,32 +45,33 @@ class UserRegistrationForm(forms.ModelForm):
     password2 = forms.CharField(
         label='Confirm Password',
         widget=forms.PasswordInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-transparent outline-none transition',
+            **TAILWIND_INPUT_ATTRS,
             'placeholder': '••••••••',
         })
     )
     agree_terms = forms.BooleanField(
         required=True,
-        widget=forms.CheckboxInput(attrs={
-            'class': 'w-4 h-4 text-indigo-600 border-gray-300 rounded focus:ring-indigo-500',
-        })
+        widget=forms.CheckboxInput(attrs=TAILWIND_CHECKBOX_ATTRS)
     )
     
     class Meta:
         model = User
         fields = ['email', 'full_name']
     
-    def clean_email(self):
-        email = self.cleaned_data.get('email')
-        if User.objects.filter(email=email).exists():
-            raise ValidationError('A user with this email already exists.')
-        return email
+    def validate_unique(self):
+        # Email uniqueness is enforced by the database; RegisterView handles the IntegrityError
+        exclude = self._get_validation_exclusions()
+        exclude.add('email')
+        try:
+            self.instance.validate_unique(exclude=exclude)
+        except ValidationError as e:
+            self._update_errors(e)
     
     def clean_password1(self):
         password = self.cleaned_data.get('password1')
         if len(password) < 8:
             raise ValidationError('Password must be at least 8 characters long.')
-        if not any(char.isdigit() for char in password):
+        if not _DIGIT_RE.search(password):
             raise ValidationError('Password must contain at least one number.')
         return password
     
@@ -86,23 +99,21 @@ class UserLoginForm(AuthenticationForm):
     username = forms.EmailField(
         label='Email',
         widget=forms.EmailInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-transparent outline-none transition',
+            **TAILWIND_INPUT_ATTRS,
             'placeholder': 'Enter your email',
             'autofocus': True,
         })
     )
     password = forms.CharField(
         widget=forms.PasswordInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-transparent outline-none transition',
+            **TAILWIND_INPUT_ATTRS,
             'placeholder': '•••••',
         })
     )
     remember_me = forms.BooleanField(
         required=False,
         initial=True,
-        widget=forms.CheckboxInput(attrs={
-            'class': 'w-4 h-4 text-indigo-600 border-gray-300 rounded focus:ring-indigo-500',
-        })
+        widget=forms.CheckboxInput(attrs=TAILWIND_CHECKBOX_ATTRS)
     )
 
 
@@ -113,11 +124,26 @@ class ProfileUpdateForm(forms.ModelForm):
         max_length=255,
         required=False,
         widget=forms.TextInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-transparent outline-none transition',
+            **TAILWIND_INPUT_ATTRS,
             'placeholder': 'Enter your full name',
         })
     )
     
+    bio = forms.CharField(
+        required=False,
+        widget=forms.Textarea(attrs={
+            **TAILWIND_INPUT_ATTRS,
+            'rows': 4,
+            'placeholder': 'Tell us a bit about yourself...',
+        })
+    )
+    
     class Meta:
         model = User
         fields = ['full_name']
+    
+    def clean_bio(self):
+        bio = self.cleaned_data.get('bio', '')
+        if len(bio) > 500:
+            raise ValidationError('Bio must be 500 characters or less.')
+        return bio
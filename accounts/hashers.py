@@ -0,0 +1,9 @@
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id hasher with OWASP-recommended cost parameters."""
+    
+    time_cost = 3
+    memory_cost = 47104  # KiB (46 MiB)
+    parallelism = 1
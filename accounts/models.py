@@ -1,5 +1,7 @@
+from django.core.cache import cache
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
+from django.contrib.auth.signals import user_logged_in
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
@@ -89,3 +91,24 @@ def create_user_profile(sender, instance, created, **kwargs):
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
     instance.profile.save()
+
+
+def dashboard_cache_key(user_id):
+    """Cache key for a user's dashboard widgets."""
+    return f'accounts:dashboard:{user_id}'
+
+
+# Signals to drop cached dashboard widgets when orders or enrollments change.
+# Keyed by user_id so the user row is never loaded. There is no post_delete
+# receiver: it would stop cascades from fast-deleting these rows, and deletes
+# are rare enough to wait out DASHBOARD_CACHE_TIMEOUT.
+@receiver(post_save, sender='orders.Order')
+@receiver(post_save, sender='courses.CourseEnrollment')
+def invalidate_dashboard_cache(sender, instance, **kwargs):
+    cache.delete(dashboard_cache_key(instance.user_id))
+
+
+# Start every session with fresh dashboard widgets
+@receiver(user_logged_in)
+def reset_dashboard_cache_on_login(sender, user, **kwargs):
+    cache.delete(dashboard_cache_key(user.pk))
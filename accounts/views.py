@@ -3,12 +3,22 @@ from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.views import LoginView
 from django.contrib import messages
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.urls import reverse_lazy
+from django.utils import timezone
+from django.views.decorators.http import require_POST
 from django.views.generic import CreateView
 
 from .forms import UserRegistrationForm, UserLoginForm, ProfileUpdateForm
-from courses.models import CourseEnrollment
-from orders.models import Order
+from .models import Profile, dashboard_cache_key
+from core.pagination import CachedCountPaginator
+from courses.models import CourseEnrollment, prefetch_published_lessons
+from orders.models import Order, OrderItem
+
+DASHBOARD_CACHE_TIMEOUT = 60  # seconds
 
 
 class RegisterView(CreateView):
@@ -24,7 +34,12 @@ class RegisterView(CreateView):
         return super().dispatch(request, *args, **kwargs)
     
     def form_valid(self, form):
-        user = form.save()
+        try:
+            with transaction.atomic():
+                user = form.save()
+        except IntegrityError:
+            form.add_error('email', 'A user with this email already exists.')
+            return self.form_invalid(form)
         login(self.request, user)
         messages.success(self.request, 'Account created successfully! Welcome to Amstack.')
         return redirect(self.success_url)
@@ -47,6 +62,7 @@ class CustomLoginView(LoginView):
         return super().form_valid(form)
 
 
+@require_POST
 def logout_view(request):
     """Logout view."""
     logout(request)
@@ -54,43 +70,96 @@ def logout_view(request):
     return redirect('core:home')
 
 
-@login_required
-def dashboard_view(request):
-    """User dashboard/profile overview."""
-    user = request.user
-    profile = user.profile
-    
-    # Get real recent orders from database
+def _order_product_label(order):
+    """Mirror Order.get_product_label() for a row fetched with .values()."""
+    label = (
+        order['post__title'] or order['course__title'] or order['service__title']
+        or order['first_item_title']
+    )
+    if label:
+        return label
+    if order['item_count'] > 1:
+        return f"{order['item_count']} items"
+    return 'Unknown product'
+
+
+def _build_dashboard_data(user):
+    """Collect the order and course progress widgets shown on the dashboard."""
+    # Get real recent orders from database as plain rows, labelled by the
+    # first item's product like Order.get_product() does for cart orders
+    first_item_title = OrderItem.objects.filter(order=OuterRef('pk')).order_by('created_at').annotate(
+        title=Coalesce('post__title', 'course__title', 'service__title'),
+    ).values('title')[:1]
     recent_orders = Order.objects.filter(
         user=user, 
         status=Order.STATUS_PAID
-    ).select_related('post', 'course', 'service').order_by('-paid_at')[:3]
+    ).annotate(
+        item_count=Count('items'),
+        first_item_title=Subquery(first_item_title),
+    ).order_by('-paid_at').values(
+        'reference', 'status', 'post__title', 'course__title', 'service__title',
+        'item_count', 'first_item_title',
+    )[:3]
+    status_labels = dict(Order.STATUS_CHOICES)
     
     # Get real courses in progress
     enrollments = CourseEnrollment.objects.filter(
         user=user
-    ).select_related('course', 'last_lesson').order_by('-enrolled_at')[:2]
+    ).select_related('course', 'last_lesson').annotate(
+        total_published_lessons=Count('course__lessons', filter=Q(course__lessons__is_published=True))
+    ).order_by('-enrolled_at')[:2]
     
     courses_progress = []
     for enrollment in enrollments:
         # Calculate progress based on lessons in course
-        total_lessons = enrollment.course.lessons.filter(is_published=True).count()
-        if total_lessons > 0:
+        if enrollment.total_published_lessons > 0:
             progress = min(100, enrollment.progress)
         else:
             progress = 0
+        
+        if enrollment.last_lesson:
+            continue_url = enrollment.last_lesson.get_absolute_url()
+        else:
+            continue_url = enrollment.course.get_absolute_url()
             
         courses_progress.append({
             'title': enrollment.course.title,
             'progress': progress,
-            'enrollment': enrollment,
+            'is_started': enrollment.last_lesson_id is not None,
+            'continue_url': continue_url,
         })
     
+    # Cache plain dicts rather than model instances to keep entries small
+    return {
+        'recent_orders': [
+            {
+                'reference': order['reference'],
+                'product_label': _order_product_label(order),
+                'status': order['status'],
+                'status_display': status_labels.get(order['status'], order['status']),
+            }
+            for order in recent_orders
+        ],
+        'courses_progress': courses_progress,
+    }
+
+
+@login_required
+def dashboard_view(request):
+    """User dashboard/profile overview."""
+    user = request.user
+    profile = user.profile
+    
+    dashboard_data = cache.get_or_set(
+        dashboard_cache_key(user.pk),
+        lambda: _build_dashboard_data(user),
+        DASHBOARD_CACHE_TIMEOUT,
+    )
+    
     context = {
         'user': user,
         'profile': profile,
-        'recent_orders': recent_orders,
-        'courses_progress': courses_progress,
+        **dashboard_data,
     }
     return render(request, 'accounts/dashboard.html', context)
 
@@ -99,19 +168,24 @@ def dashboard_view(request):
 def saved_tutorials_view(request):
     """View saved tutorials."""
     from blog.models import SavedPost
-    from django.core.paginator import Paginator
     
     # Get user's saved posts
-    saved_posts_queryset = SavedPost.objects.filter(user=request.user).select_related('post').order_by('-saved_at')
+    saved_posts_queryset = SavedPost.objects.filter(user=request.user).select_related(
+        'post', 'post__category'
+    ).only(
+        'saved_at', 'post__title', 'post__slug', 'post__excerpt', 'post__reading_time',
+        'post__category__name',
+    ).order_by('-saved_at')
     
     # Pagination
-    paginator = Paginator(saved_posts_queryset, 12)
+    paginator = CachedCountPaginator(saved_posts_queryset, 12)
     page = request.GET.get('page', 1)
     saved_posts_page = paginator.get_page(page)
     
+    user = request.user
     context = {
-        'user': request.user,
-        'profile': request.user.profile,
+        'user': user,
+        'profile': user.profile,
         'saved_posts': saved_posts_page,
         'total_saved': paginator.count,
         'is_paginated': paginator.num_pages > 1,
@@ -126,25 +200,41 @@ def my_courses_view(request):
     enrollments = (
         CourseEnrollment.objects
         .filter(user=request.user)
-        .select_related('course', 'last_lesson')
+        .select_related('course')
+        .prefetch_related(prefetch_published_lessons())
         .order_by('-enrolled_at')
     )
-    return render(request, 'accounts/my_courses.html', {'enrollments': enrollments})
+    stats = enrollments.aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(progress__gte=100)),
+    )
+    return render(request, 'accounts/my_courses.html', {
+        'enrollments': enrollments,
+        'stats': stats,
+    })
 
 
 @login_required
 def my_orders_view(request):
     """View order history."""
-    from django.core.paginator import Paginator
     
     # Only show paid and failed orders (exclude pending to reduce clutter)
     orders = Order.objects.filter(
         user=request.user,
         status__in=[Order.STATUS_PAID, Order.STATUS_FAILED, Order.STATUS_REFUNDED]
-    ).select_related('post', 'course', 'service').order_by('-created_at')
+    ).select_related('post', 'course', 'service').only(
+        'order_number', 'reference', 'product_type', 'status',
+        'total_amount', 'amount', 'created_at', 'paid_at',
+        'post__title', 'post__slug',
+        'course__title', 'course__slug',
+        'service__title', 'service__slug',
+    ).prefetch_related(
+        # Orders from the cart carry their products on the items instead
+        Prefetch('items', queryset=OrderItem.objects.select_related('post', 'course', 'service'))
+    ).order_by('-created_at')
     
     # Pagination
-    paginator = Paginator(orders, 20)
+    paginator = CachedCountPaginator(orders, 20)
     page = request.GET.get('page', 1)
     orders_page = paginator.get_page(page)
     
@@ -158,39 +248,29 @@ def my_orders_view(request):
 @login_required
 def profile_settings_view(request):
     """Update profile settings."""
+    user = request.user
+    profile = user.profile
     if request.method == 'POST':
-        form = ProfileUpdateForm(request.POST, instance=request.user)
+        form = ProfileUpdateForm(request.POST, instance=user)
         if form.is_valid():
-            # Save user fields
-            user = form.save()
-            
-            # Update profile fields
-            profile = user.profile
-            bio = request.POST.get('bio', '').strip()
-            if len(bio) <= 500:  # Validate bio length
-                profile.bio = bio
-            else:
-                messages.error(request, 'Bio must be 500 characters or less.')
-                return render(request, 'accounts/profile_settings.html', {
-                    'form': form,
-                    'user': request.user,
-                    'profile': request.user.profile
-                })
-            
+            profile.bio = form.cleaned_data['bio']
             profile.newsletter_subscribed = request.POST.get('newsletter_subscribed') == 'on'
-            profile.save()
+            
+            # Saving the user also saves its cached profile (save_user_profile)
+            with transaction.atomic():
+                form.save()
             
             messages.success(request, 'Profile updated successfully!')
             return redirect('accounts:profile_settings')
         else:
             messages.error(request, 'Please correct the errors below.')
     else:
-        form = ProfileUpdateForm(instance=request.user)
+        form = ProfileUpdateForm(instance=user, initial={'bio': profile.bio})
     
     context = {
         'form': form,
-        'user': request.user,
-        'profile': request.user.profile
+        'user': user,
+        'profile': profile
     }
     return render(request, 'accounts/profile_settings.html', context)
 
@@ -199,10 +279,15 @@ def profile_settings_view(request):
 def newsletter_settings_view(request):
     """Newsletter subscription settings."""
     if request.method == 'POST':
-        profile = request.user.profile
-        profile.newsletter_subscribed = request.POST.get('subscribed', False) == 'on'
-        profile.save()
+        subscribed = request.POST.get('subscribed') == 'on'
+        Profile.objects.filter(user_id=request.user.pk).update(
+            newsletter_subscribed=subscribed, updated_at=timezone.now()
+        )
         messages.success(request, 'Newsletter preferences updated!')
         return redirect('accounts:newsletter_settings')
     
-    return render(request, 'accounts/newsletter_settings.html')
+    user = request.user
+    return render(request, 'accounts/newsletter_settings.html', {
+        'user': user,
+        'profile': user.profile,
+    })
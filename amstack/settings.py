@@ -1,4 +1,6 @@
 from pathlib import Path
+from importlib.util import find_spec
+import logging
 import os
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -58,6 +60,14 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# N+1 query detection in development (optional dependency)
+if DEBUG and find_spec('nplusone'):
+    INSTALLED_APPS += ['nplusone.ext.django']
+    MIDDLEWARE = ['nplusone.ext.django.NPlusOneMiddleware'] + MIDDLEWARE
+    NPLUSONE_LOGGER = logging.getLogger('nplusone')
+    NPLUSONE_LOG_LEVEL = logging.WARN
+    NPLUSONE_RAISE = os.getenv('NPLUSONE_RAISE', 'False').lower() in ('true', '1', 'yes')
+
 ROOT_URLCONF = 'amstack.urls'
 
 TEMPLATES = [
@@ -107,6 +117,30 @@ else:
     }
 
 
+# Cache configuration with environment variable support
+if os.getenv('REDIS_URL'):
+    # Production cache (shared across worker processes)
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            },
+        }
+    }
+else:
+    # Development cache (per-process memory)
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Sessions are read from the cache and written through to the database
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -126,6 +160,16 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing: Argon2id first, older hashers kept so existing passwords
+# still verify and get upgraded on next login
+PASSWORD_HASHERS = [
+    'accounts.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/6.0/topics/i18n/
 
@@ -239,6 +283,11 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': False,
         },
+        'nplusone': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
     },
 }
 
@@ -253,14 +302,14 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.CachedCountPageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'api.renderers.ORJSONRenderer',
     ],
 }
 
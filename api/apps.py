@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     name = 'api'
+    
+    def ready(self):
+        # Register cache invalidation signal handlers
+        from . import cache  # noqa: F401
@@ -0,0 +1,46 @@
+"""
+Response caching for public API endpoints
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.response import Response
+
+API_CACHE_TIMEOUT = 300  # seconds
+API_CACHE_VERSION_KEY = 'api:cache_version'
+
+
+def api_cache_key(request, name):
+    """Build a cache key for the request URL under the current cache generation."""
+    version = cache.get_or_set(API_CACHE_VERSION_KEY, time.time_ns, None)
+    url_hash = hashlib.md5(request.build_absolute_uri().encode('utf-8')).hexdigest()
+    return f'api:{version}:{name}:{url_hash}'
+
+
+def get_cached_api_data(request, name, builder, timeout=API_CACHE_TIMEOUT):
+    """Return cached response data for the request, building it on a miss."""
+    return cache.get_or_set(api_cache_key(request, name), builder, timeout)
+
+
+class CachedListMixin:
+    """Cache list responses that do not depend on the requesting user."""
+    
+    cache_name = None
+    
+    def list(self, request, *args, **kwargs):
+        data = get_cached_api_data(
+            request, self.cache_name, lambda: super(CachedListMixin, self).list(request, *args, **kwargs).data
+        )
+        return Response(data)
+
+
+# Signals to start a new cache generation whenever blog content changes
+@receiver([post_save, post_delete], sender='blog.Post')
+@receiver([post_save, post_delete], sender='blog.Category')
+@receiver([post_save, post_delete], sender='blog.Tag')
+@receiver(m2m_changed, sender='blog.Post_tags')
+def invalidate_api_cache(sender, **kwargs):
+    cache.set(API_CACHE_VERSION_KEY, time.time_ns(), None)
@@ -0,0 +1,61 @@
+"""
+Filter backends for the post list API views
+"""
+from functools import lru_cache
+
+from django.core.exceptions import ValidationError
+from django.db import models
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend, OrderingFilter, SearchFilter
+
+from blog.search import has_full_text_search, search_posts
+
+
+@lru_cache(maxsize=None)
+def get_filter_field(model, name):
+    """Resolve a filterset field name to its model field once per model."""
+    return model._meta.get_field(name)
+
+
+class PostFieldFilter(BaseFilterBackend):
+    """
+    Exact-match filtering on the view's ``filterset_fields``. Query values are
+    converted with the model field's ``to_python`` (booleans also accept
+    true/false); invalid values match nothing.
+    """
+    boolean_field = serializers.BooleanField()
+
+    def filter_queryset(self, request, queryset, view):
+        lookups = {}
+        for name in getattr(view, 'filterset_fields', ()):
+            value = request.query_params.get(name)
+            if value in (None, ''):
+                continue
+            field = get_filter_field(queryset.model, name)
+            try:
+                if isinstance(field, models.BooleanField):
+                    lookups[field.attname] = self.boolean_field.to_internal_value(value)
+                else:
+                    lookups[field.attname] = field.to_python(value)
+            except (ValidationError, serializers.ValidationError):
+                return queryset.none()
+
+        if lookups:
+            queryset = queryset.filter(**lookups)
+        return queryset
+
+
+class PostSearchFilter(SearchFilter):
+    """Search through the full-text index where the database provides one."""
+
+    def filter_queryset(self, request, queryset, view):
+        if not has_full_text_search():
+            return super().filter_queryset(request, queryset, view)
+
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+        return search_posts(queryset, ' '.join(search_terms))
+
+
+POST_FILTER_BACKENDS = [PostFieldFilter, PostSearchFilter, OrderingFilter]
@@ -0,0 +1,39 @@
+"""
+Pagination classes for the API
+"""
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+from core.pagination import CachedCountPaginator
+
+
+class CachedCountPageNumberPagination(PageNumberPagination):
+    """Page number pagination that reuses a cached COUNT(*) between page hits."""
+    django_paginator_class = CachedCountPaginator
+
+
+class PostCursorPagination(CursorPagination):
+    """Keyset pagination on (-published_at, -id): no COUNT and no OFFSET scans."""
+    ordering = ('-published_at', '-id')
+
+
+class PostListPagination(CachedCountPageNumberPagination):
+    """
+    Page numbers by default, as documented for the post lists. Passing a
+    ``cursor`` parameter (empty for the first page) switches to keyset pages,
+    which stay fast however deep the client scrolls.
+    """
+    cursor_query_param = PostCursorPagination.cursor_query_param
+    
+    def __init__(self):
+        self.cursor_pagination = None
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param in request.query_params:
+            self.cursor_pagination = PostCursorPagination()
+            return self.cursor_pagination.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+    
+    def get_paginated_response(self, data):
+        if self.cursor_pagination is not None:
+            return self.cursor_pagination.get_paginated_response(data)
+        return super().get_paginated_response(data)
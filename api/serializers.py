@@ -2,32 +2,193 @@
 Serializers for API endpoints
 """
 from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
 from blog.models import Post, Category, Tag
-from orders.models import Order
+from orders.models import Order, OrderItem
 from django.contrib.auth import get_user_model
+from django.db.models import Exists, OuterRef, Q
+from django.utils.functional import cached_property
 
 User = get_user_model()
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class FastModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer that resolves its readable fields once per serializer
+    instance and reads plain attributes with getattr() instead of going
+    through Field.get_attribute() for every row.
+    """
+    
+    def get_field_plan(self, instance):
+        """Return cached (field_name, field, attr) tuples; attr is None for the slow path."""
+        plan = getattr(self, '_field_plan', None)
+        if plan is None:
+            model_class = type(instance)
+            plan = []
+            for field in self._readable_fields:
+                attr = field.source_attrs[0] if len(field.source_attrs) == 1 else None
+                if (
+                    isinstance(field, (serializers.RelatedField, serializers.ManyRelatedField))
+                    or callable(getattr(model_class, attr or '', None))
+                ):
+                    attr = None
+                plan.append((field.field_name, field, attr))
+            self._field_plan = plan
+        return plan
+    
+    def to_representation(self, instance):
+        ret = {}
+        for field_name, field, attr in self.get_field_plan(instance):
+            try:
+                if attr is None:
+                    attribute = field.get_attribute(instance)
+                else:
+                    try:
+                        attribute = getattr(instance, attr)
+                    except AttributeError:
+                        # Let DRF apply defaults / allow_null / SkipField
+                        attribute = field.get_attribute(instance)
+            except SkipField:
+                continue
+            
+            check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+            if check_for_none is None:
+                ret[field_name] = None
+            else:
+                ret[field_name] = field.to_representation(attribute)
+        return ret
+
+
+def get_paid_post_ids(user, post_ids):
+    """Return the subset of ``post_ids`` the user has a paid order for."""
+    if not user.is_authenticated or not post_ids:
+        return frozenset()
+    # Legacy orders link the post directly; cart orders link it through items
+    legacy = Order.objects.filter(
+        user=user,
+        post_id__in=post_ids,
+        status=Order.STATUS_PAID
+    ).order_by().values_list('post_id', flat=True)
+    items = OrderItem.objects.filter(
+        order__user=user,
+        post_id__in=post_ids,
+        order__status=Order.STATUS_PAID
+    ).order_by().values_list('post_id', flat=True)
+    return frozenset(legacy.union(items))
+
+
+def annotate_paid_access(queryset, user):
+    """
+    Annotate each post with ``has_paid_order`` for an authenticated user so
+    is_accessible comes back as a column instead of a separate Order query.
+    Matches orders.utils.user_has_post_access(): legacy orders and cart items.
+    """
+    if not user.is_authenticated:
+        return queryset
+    has_item = Exists(OrderItem.objects.filter(order=OuterRef('pk'), post=OuterRef(OuterRef('pk'))))
+    return queryset.annotate(has_paid_order=Exists(Order.objects.filter(
+        Q(post=OuterRef('pk')) | has_item,
+        user=user,
+        status=Order.STATUS_PAID
+    )))
+
+
+class PaidPostAccessMixin:
+    """Resolve the current user's paid post IDs once per serializer tree."""
+    
+    def get_paid_post_ids(self, posts):
+        """Return the IDs of ``posts`` the current user has paid for."""
+        paid_post_ids = self.context.get('paid_post_ids')
+        if paid_post_ids is not None:
+            return paid_post_ids
+        
+        request = self.context.get('request')
+        if not request:
+            paid_post_ids = frozenset()
+        else:
+            paid_post_ids = get_paid_post_ids(
+                request.user, [post.id for post in posts if not post.is_free]
+            )
+        
+        # Share the result with every child serializer through the root context
+        self.root._context['paid_post_ids'] = paid_post_ids
+        return paid_post_ids
+    
+    @cached_property
+    def user_is_authenticated(self):
+        """Whether the request user is logged in, resolved once per serializer."""
+        request = self.context.get('request')
+        return bool(request and request.user.is_authenticated)
+    
+    def user_has_paid(self, obj):
+        # Querysets from the API views may carry an Exists() annotation already
+        has_paid_order = getattr(obj, 'has_paid_order', None)
+        if has_paid_order is not None:
+            return has_paid_order
+        return obj.id in self.get_paid_post_ids([obj])
+    
+    def has_access(self, obj):
+        """Check if user can access this post"""
+        # If post is free, everyone can access
+        if obj.is_free:
+            return True
+        
+        # If user is not authenticated, only free posts
+        if not self.user_is_authenticated:
+            return False
+        
+        # Check if user has paid for this post
+        return self.user_has_paid(obj)
+    
+    def get_is_accessible(self, obj):
+        return self.has_access(obj)
+
+
+class PostAccessListSerializer(PaidPostAccessMixin, serializers.ListSerializer):
+    """List serializer that loads paid post access for the whole page in one query."""
+    
+    def to_representation(self, data):
+        posts = list(data.all() if hasattr(data, 'all') else data)
+        if not all(hasattr(post, 'has_paid_order') for post in posts):
+            self.get_paid_post_ids(posts)
+        return super().to_representation(posts)
+
+
+class CategorySerializer(FastModelSerializer):
     """Serializer for Category model"""
     subcategories = serializers.SerializerMethodField()
     posts_count = serializers.SerializerMethodField()
+    
+    # How many levels of subcategories to nest below a category
+    max_subcategory_depth = 1
 
     class Meta:
         model = Category
         fields = ['id', 'name', 'slug', 'parent', 'subcategories', 'posts_count', 'is_active']
         
+    @cached_property
+    def subcategory_serializer(self):
+        """One serializer for every subcategory rendered by this instance."""
+        return CategorySerializer(context={'subcategory_depth': self.context.get('subcategory_depth', 0) + 1})
+    
     def get_subcategories(self, obj):
-        if obj.is_parent and obj.subcategories.exists():
-            return CategorySerializer(obj.subcategories.filter(is_active=True), many=True).data
-        return []
+        depth = self.context.get('subcategory_depth', 0)
+        if not obj.is_parent or depth >= self.max_subcategory_depth:
+            return []
+        # Use the annotated Prefetch from CategoryListView when available
+        subcategories = getattr(obj, 'active_subcategories', None)
+        if subcategories is None:
+            subcategories = obj.subcategories.filter(is_active=True)
+        return [self.subcategory_serializer.to_representation(category) for category in subcategories]
         
     def get_posts_count(self, obj):
+        if hasattr(obj, 'published_posts_count'):
+            return obj.published_posts_count
         return obj.posts.filter(is_published=True).count()
 
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(FastModelSerializer):
     """Serializer for Tag model"""
     posts_count = serializers.SerializerMethodField()
     
@@ -36,10 +197,30 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'slug', 'color', 'posts_count']
         
     def get_posts_count(self, obj):
+        if hasattr(obj, 'published_posts_count'):
+            return obj.published_posts_count
         return obj.posts.filter(is_published=True).count()
 
 
-class AuthorSerializer(serializers.ModelSerializer):
+class PostTagsMixin:
+    """
+    Render post tags through a single TagSerializer per serializer instance
+    instead of building (and deep-copying the fields of) a new one per post.
+    """
+    
+    @cached_property
+    def tag_serializer(self):
+        return TagSerializer(context=self.context)
+    
+    def get_tags(self, obj):
+        # Prefer the cached_tags prefetch from the API views
+        tags = getattr(obj, 'cached_tags', None)
+        if tags is None:
+            tags = obj.tags.all()
+        return [self.tag_serializer.to_representation(tag) for tag in tags]
+
+
+class AuthorSerializer(FastModelSerializer):
     """Serializer for User model (as author)"""
     
     class Meta:
@@ -47,10 +228,10 @@ class AuthorSerializer(serializers.ModelSerializer):
         fields = ['id', 'email', 'full_name']
 
 
-class PostListSerializer(serializers.ModelSerializer):
+class PostListSerializer(PaidPostAccessMixin, PostTagsMixin, FastModelSerializer):
     """Serializer for Post list view - minimal fields for performance"""
     category = CategorySerializer(read_only=True)
-    tags = TagSerializer(many=True, read_only=True)
+    tags = serializers.SerializerMethodField()
     author = AuthorSerializer(read_only=True)
     reading_time = serializers.ReadOnlyField()
     is_accessible = serializers.SerializerMethodField()
@@ -62,33 +243,13 @@ class PostListSerializer(serializers.ModelSerializer):
             'published_at', 'reading_time', 'is_featured', 'is_free', 'price',
             'post_type', 'category', 'tags', 'author', 'is_accessible'
         ]
-    
-    def get_is_accessible(self, obj):
-        """Check if user can access this post"""
-        request = self.context.get('request')
-        if not request:
-            return obj.is_free
-            
-        # If post is free, everyone can access
-        if obj.is_free:
-            return True
-            
-        # If user is not authenticated, only free posts
-        if not request.user.is_authenticated:
-            return False
-            
-        # Check if user has paid for this post
-        return Order.objects.filter(
-            user=request.user,
-            post=obj,
-            status='paid'
-        ).exists()
+        list_serializer_class = PostAccessListSerializer
 
 
-class PostDetailSerializer(serializers.ModelSerializer):
+class PostDetailSerializer(PaidPostAccessMixin, PostTagsMixin, serializers.ModelSerializer):
     """Serializer for Post detail view"""
     category = CategorySerializer(read_only=True)
-    tags = TagSerializer(many=True, read_only=True)
+    tags = serializers.SerializerMethodField()
     author = AuthorSerializer(read_only=True)
     reading_time = serializers.ReadOnlyField()
     get_seo_title = serializers.ReadOnlyField()
@@ -107,51 +268,24 @@ class PostDetailSerializer(serializers.ModelSerializer):
             'is_accessible'
         ]
     
+    def has_access(self, obj):
+        """Use the view-computed access flag, falling back to a lookup"""
+        has_access = self.context.get('has_access')
+        if has_access is not None:
+            return has_access
+        return super().has_access(obj)
+    
     def get_content(self, obj):
         """Return content only if user has access"""
-        request = self.context.get('request')
-        
-        # If post is free, return content
-        if obj.is_free:
+        if self.has_access(obj):
             return obj.content
-            
+        
         # If user is not authenticated, return None
-        if not request or not request.user.is_authenticated:
+        if not self.user_is_authenticated:
             return None
-            
-        # Check if user has paid for this post
-        has_access = Order.objects.filter(
-            user=request.user,
-            post=obj,
-            status='paid'
-        ).exists()
         
-        if has_access:
-            return obj.content
-        else:
-            # Return a teaser (first 500 characters)
-            return obj.content[:500] + "... [Content locked - Purchase required]"
-    
-    def get_is_accessible(self, obj):
-        """Check if user can access this post"""
-        request = self.context.get('request')
-        if not request:
-            return obj.is_free
-            
-        # If post is free, everyone can access
-        if obj.is_free:
-            return True
-            
-        # If user is not authenticated, only free posts
-        if not request.user.is_authenticated:
-            return False
-            
-        # Check if user has paid for this post
-        return Order.objects.filter(
-            user=request.user,
-            post=obj,
-            status='paid'
-        ).exists()
+        # Return a teaser (first 500 characters)
+        return obj.content[:500] + "... [Content locked - Purchase required]"
 
 
 class FreePostSerializer(PostDetailSerializer):
@@ -169,15 +303,21 @@ class PaidPostAccessSerializer(serializers.Serializer):
     purchase_required = serializers.BooleanField(read_only=True)
     price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
     
-    def validate_post_id(self, value):
+    def validate(self, attrs):
         """Validate that post exists and is not free"""
-        try:
-            post = Post.objects.get(id=value, is_published=True)
-            if post.is_free:
-                raise serializers.ValidationError("This post is free and doesn't require purchase")
-            return value
-        except Post.DoesNotExist:
-            raise serializers.ValidationError("Post not found")
+        request = self.context['request']
+        # Fetch the post and the user's paid order state in a single query
+        post = annotate_paid_access(
+            Post.objects.filter(id=attrs['post_id'], is_published=True), request.user
+        ).only('id', 'title', 'slug', 'is_free', 'price').first()
+        
+        if post is None:
+            raise serializers.ValidationError({'post_id': "Post not found"})
+        if post.is_free:
+            raise serializers.ValidationError({'post_id': "This post is free and doesn't require purchase"})
+        
+        attrs['post'] = post
+        return attrs
 
 
 class UserPostAccessSerializer(serializers.ModelSerializer):
@@ -1,3 +1,103 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from blog.models import Post
+from orders.models import Order, OrderItem
+from orders.utils import user_has_post_access
+
+from .cache import api_cache_key
+from .serializers import annotate_paid_access, get_paid_post_ids
+from .views import latest_posts
+
+User = get_user_model()
+
+
+class PaidAccessTests(TestCase):
+    """The API's paid access columns agree with orders.utils.user_has_post_access()."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='buyer@example.com', password='secret')
+        other_user = User.objects.create_user(email='other@example.com', password='secret')
+
+        def make_post(title, is_free=False):
+            return Post.objects.create(
+                title=title, content='Body', excerpt='Excerpt', is_published=True,
+                is_free=is_free, price=Decimal('0.00' if is_free else '5.00')
+            )
+
+        cls.free = make_post('Free', is_free=True)
+        cls.legacy = make_post('Legacy order')
+        cls.cart = make_post('Cart order')
+        cls.pending = make_post('Pending order')
+        cls.others = make_post("Someone else's order")
+        cls.unbought = make_post('Not bought')
+
+        Order.objects.create(user=cls.user, post=cls.legacy, status=Order.STATUS_PAID)
+        for user, post, status in [
+            (cls.user, cls.cart, Order.STATUS_PAID),
+            (cls.user, cls.pending, Order.STATUS_PENDING),
+            (other_user, cls.others, Order.STATUS_PAID),
+        ]:
+            order = Order.objects.create(user=user, status=status)
+            OrderItem.objects.create(order=order, post=post, unit_price=post.price)
+
+    def assertMatchesSiteAccess(self, user):
+        for post in annotate_paid_access(Post.objects.all(), user):
+            api_access = post.is_free or getattr(post, 'has_paid_order', False)
+            with self.subTest(post=post.title):
+                self.assertEqual(api_access, user_has_post_access(user, post))
+
+    def test_buyer(self):
+        self.assertMatchesSiteAccess(self.user)
+
+    def test_anonymous(self):
+        self.assertMatchesSiteAccess(AnonymousUser())
+
+    def test_paid_post_ids(self):
+        posts = Post.objects.filter(is_free=False)
+        self.assertEqual(
+            get_paid_post_ids(self.user, [post.id for post in posts]),
+            {post.id for post in posts if user_has_post_access(self.user, post)},
+        )
+        self.assertEqual(get_paid_post_ids(AnonymousUser(), [self.legacy.id]), frozenset())
+
+
+class ApiCacheTests(TestCase):
+    """Cached public responses start a new generation when posts change."""
+
+    def setUp(self):
+        cache.clear()
+        self.post = Post.objects.create(
+            title='Original title', content='Body', excerpt='Excerpt',
+            is_published=True, is_free=True
+        )
+
+    def test_post_save_changes_cache_key(self):
+        request = RequestFactory().get('/api/v1/posts/latest/')
+        key = api_cache_key(request, 'latest_posts')
+        self.assertEqual(api_cache_key(request, 'latest_posts'), key)
+
+        self.post.save()
+        self.assertNotEqual(api_cache_key(request, 'latest_posts'), key)
+
+    def test_cached_response_reflects_post_save(self):
+        def titles():
+            response = latest_posts(RequestFactory().get('/api/v1/posts/latest/'))
+            return [post['title'] for post in response.data['results']]
+
+        self.assertEqual(titles(), ['Original title'])
+
+        self.post.title = 'Updated title'
+        self.post.save()
+        self.assertEqual(titles(), ['Updated title'])
+
+    def test_post_delete_changes_cache_key(self):
+        request = RequestFactory().get('/api/v1/posts/latest/')
+        key = api_cache_key(request, 'latest_posts')
+        self.post.delete()
+        self.assertNotEqual(api_cache_key(request, 'latest_posts'), key)
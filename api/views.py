@@ -1,18 +1,25 @@
 """
 API Views for Blog Posts with access control
 """
-from rest_framework import generics, permissions, status
+from collections import defaultdict
+
+from rest_framework import generics, permissions, serializers, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db.models import Count, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
 from blog.models import Post, Category, Tag
+from blog.search import search_posts
 from orders.models import Order
+from .cache import CachedListMixin, get_cached_api_data
+from .filters import POST_FILTER_BACKENDS
+from .pagination import PostListPagination
 from .serializers import (
     PostListSerializer, PostDetailSerializer, FreePostSerializer,
     CategorySerializer, TagSerializer, PaidPostAccessSerializer,
-    UserPostAccessSerializer
+    UserPostAccessSerializer, annotate_paid_access
 )
 
 
@@ -29,22 +36,194 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
         return obj.author == request.user
 
 
-class FreePostListView(generics.ListAPIView):
+def annotate_categories(queryset):
+    """
+    Prepare a Category queryset for CategorySerializer: annotate published
+    post counts and prefetch active subcategories in a fixed number of queries.
+    """
+    published_posts_count = Count('posts', filter=Q(posts__is_published=True))
+    active_subcategories = Category.objects.filter(is_active=True).annotate(
+        published_posts_count=published_posts_count
+    ).order_by('order', 'name')
+    # Meta.ordering is not applied to GROUP BY queries, so order explicitly
+    return queryset.annotate(
+        published_posts_count=published_posts_count
+    ).prefetch_related(
+        Prefetch('subcategories', queryset=active_subcategories, to_attr='active_subcategories')
+    ).order_by('order', 'name')
+
+
+# Columns needed by PostListSerializer
+POST_LIST_FIELDS = (
+    'id', 'title', 'slug', 'excerpt', 'cover_image', 'published_at',
+    'reading_time', 'is_featured', 'is_free', 'price',
+    'post_type', 'category', 'author', 'author__email', 'author__full_name',
+)
+
+
+def prefetch_post_tags():
+    """
+    Prefetch post tags into ``cached_tags`` with just the columns TagSerializer
+    renders and their published post counts annotated.
+    """
+    # A correlated subquery, since a Count() join would be grouped per prefetched post
+    published_posts = Post.tags.through.objects.filter(
+        tag_id=OuterRef('pk'),
+        post__is_published=True
+    ).order_by().values('tag_id').annotate(count=Count('post_id')).values('count')
+    tags = Tag.objects.only('id', 'name', 'slug', 'color').annotate(
+        published_posts_count=Coalesce(Subquery(published_posts), 0)
+    ).order_by('name')
+    return Prefetch('tags', queryset=tags, to_attr='cached_tags')
+
+
+def post_list_queryset(queryset):
+    """
+    Load only what PostListSerializer renders. Categories are prefetched with
+    their counts and subcategories annotated, so the nested CategorySerializer
+    does not query per post.
+    """
+    return queryset.select_related('author').prefetch_related(
+        Prefetch('category', queryset=annotate_categories(Category.objects.all())),
+        prefetch_post_tags(),
+    ).only(*POST_LIST_FIELDS)
+
+
+class PostValuesListMixin:
+    """
+    Build post list responses from .values() rows instead of model instances
+    and nested serializers. The response shape matches PostListSerializer.
+    """
+    list_values = (
+        'id', 'title', 'slug', 'excerpt', 'cover_image', 'published_at',
+        'reading_time', 'is_featured', 'is_free', 'price',
+        'post_type', 'category_id', 'author_id', 'author__email', 'author__full_name',
+    )
+    published_at_field = serializers.DateTimeField(read_only=True)
+    price_field = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        list_values = self.list_values
+        if request.user.is_authenticated:
+            queryset = annotate_paid_access(queryset, request.user)
+            list_values += ('has_paid_order',)
+        queryset = queryset.values(*list_values)
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.build_post_dicts(page))
+        return Response(self.build_post_dicts(list(queryset)))
+    
+    def build_post_dicts(self, rows):
+        post_ids = [row['id'] for row in rows]
+        categories = self.get_category_data({row['category_id'] for row in rows if row['category_id']})
+        tags = self.get_tag_data(post_ids)
+        cover_storage = Post._meta.get_field('cover_image').storage
+        
+        results = []
+        for row in rows:
+            if row['is_free']:
+                is_accessible = True
+            elif not self.request.user.is_authenticated:
+                is_accessible = False
+            else:
+                is_accessible = row['has_paid_order']
+            
+            cover_image = None
+            if row['cover_image']:
+                cover_image = self.request.build_absolute_uri(cover_storage.url(row['cover_image']))
+            
+            author = None
+            if row['author_id']:
+                author = {
+                    'id': row['author_id'],
+                    'email': row['author__email'],
+                    'full_name': row['author__full_name'],
+                }
+            
+            results.append({
+                'id': row['id'],
+                'title': row['title'],
+                'slug': row['slug'],
+                'excerpt': row['excerpt'],
+                'cover_image': cover_image,
+                'published_at': self.published_at_field.to_representation(row['published_at']),
+                'reading_time': row['reading_time'],
+                'is_featured': row['is_featured'],
+                'is_free': row['is_free'],
+                'price': self.price_field.to_representation(row['price']),
+                'post_type': row['post_type'],
+                'category': categories.get(row['category_id']),
+                'tags': tags[row['id']],
+                'author': author,
+                'is_accessible': is_accessible,
+            })
+        return results
+    
+    def get_category_data(self, category_ids):
+        """Serialize the given categories once, keyed by ID."""
+        if not category_ids:
+            return {}
+        categories = annotate_categories(Category.objects.filter(id__in=category_ids))
+        return {category['id']: category for category in CategorySerializer(categories, many=True).data}
+    
+    def get_tag_data(self, post_ids):
+        """Serialize the tags of the given posts, grouped by post ID in name order."""
+        tags_by_post = defaultdict(list)
+        links = list(
+            Post.tags.through.objects.filter(post_id__in=post_ids).values_list('post_id', 'tag_id')
+        )
+        if not links:
+            return tags_by_post
+        
+        tags = Tag.objects.filter(id__in={tag_id for _, tag_id in links}).annotate(
+            published_posts_count=Count('posts', filter=Q(posts__is_published=True))
+        ).order_by('name')
+        tag_data = {tag['id']: tag for tag in TagSerializer(tags, many=True).data}
+        position = {tag_id: index for index, tag_id in enumerate(tag_data)}
+        
+        for post_id, tag_id in sorted(links, key=lambda link: position[link[1]]):
+            tags_by_post[post_id].append(tag_data[tag_id])
+        return tags_by_post
+
+
+class FreePostListView(PostValuesListMixin, generics.ListAPIView):
     """
     List all free blog posts - accessible to everyone
     """
     serializer_class = PostListSerializer
     permission_classes = [permissions.AllowAny]
+    filter_backends = POST_FILTER_BACKENDS
     filterset_fields = ['category', 'post_type', 'is_featured']
     search_fields = ['title', 'excerpt', 'content']
     ordering_fields = ['published_at', 'title', 'reading_time']
-    ordering = ['-published_at']
+    ordering = ['-published_at', '-id']
+    pagination_class = PostListPagination
     
     def get_queryset(self):
         return Post.objects.filter(
             is_published=True,
             is_free=True
-        ).select_related('author', 'category').prefetch_related('tags')
+        )
+
+
+class PostAccessDetailMixin:
+    """
+    Resolve the user's access to the post once in the view and hand it to
+    the serializer as ``has_access``.
+    """
+    
+    def filter_queryset(self, queryset):
+        # Load the paid order state together with the post itself
+        return annotate_paid_access(super().filter_queryset(queryset), self.request.user)
+    
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        context = self.get_serializer_context()
+        context['has_access'] = instance.is_free or getattr(instance, 'has_paid_order', False)
+        serializer = self.get_serializer_class()(instance, context=context)
+        return Response(serializer.data)
 
 
 class FreePostDetailView(generics.RetrieveAPIView):
@@ -59,28 +238,30 @@ class FreePostDetailView(generics.RetrieveAPIView):
         return Post.objects.filter(
             is_published=True,
             is_free=True
-        ).select_related('author', 'category').prefetch_related('tags')
+        ).select_related('author', 'category').prefetch_related(prefetch_post_tags())
 
 
-class PaidPostListView(generics.ListAPIView):
+class PaidPostListView(PostValuesListMixin, generics.ListAPIView):
     """
     List all paid blog posts - accessible to everyone but content restricted
     """
     serializer_class = PostListSerializer
     permission_classes = [permissions.AllowAny]
+    filter_backends = POST_FILTER_BACKENDS
     filterset_fields = ['category', 'post_type', 'price']
     search_fields = ['title', 'excerpt']
     ordering_fields = ['published_at', 'title', 'price', 'reading_time']
-    ordering = ['-published_at']
+    ordering = ['-published_at', '-id']
+    pagination_class = PostListPagination
     
     def get_queryset(self):
         return Post.objects.filter(
             is_published=True,
             is_free=False
-        ).select_related('author', 'category').prefetch_related('tags')
+        )
 
 
-class PaidPostDetailView(generics.RetrieveAPIView):
+class PaidPostDetailView(PostAccessDetailMixin, generics.RetrieveAPIView):
     """
     Retrieve a paid blog post - content access controlled by payment status
     """
@@ -92,27 +273,29 @@ class PaidPostDetailView(generics.RetrieveAPIView):
         return Post.objects.filter(
             is_published=True,
             is_free=False
-        ).select_related('author', 'category').prefetch_related('tags')
+        ).select_related('author', 'category').prefetch_related(prefetch_post_tags())
 
 
-class AllPostListView(generics.ListAPIView):
+class AllPostListView(PostValuesListMixin, generics.ListAPIView):
     """
     List all blog posts (free and paid) - content access controlled
     """
     serializer_class = PostListSerializer
     permission_classes = [permissions.AllowAny]
+    filter_backends = POST_FILTER_BACKENDS
     filterset_fields = ['category', 'post_type', 'is_free', 'is_featured']
     search_fields = ['title', 'excerpt']
     ordering_fields = ['published_at', 'title', 'price', 'reading_time']
-    ordering = ['-published_at']
+    ordering = ['-published_at', '-id']
+    pagination_class = PostListPagination
     
     def get_queryset(self):
         return Post.objects.filter(
             is_published=True
-        ).select_related('author', 'category').prefetch_related('tags')
+        )
 
 
-class PostDetailView(generics.RetrieveAPIView):
+class PostDetailView(PostAccessDetailMixin, generics.RetrieveAPIView):
     """
     Retrieve any blog post by slug - content access controlled
     """
@@ -123,18 +306,19 @@ class PostDetailView(generics.RetrieveAPIView):
     def get_queryset(self):
         return Post.objects.filter(
             is_published=True
-        ).select_related('author', 'category').prefetch_related('tags')
+        ).select_related('author', 'category').prefetch_related(prefetch_post_tags())
 
 
-class CategoryListView(generics.ListAPIView):
+class CategoryListView(CachedListMixin, generics.ListAPIView):
     """
     List all active categories
     """
     serializer_class = CategorySerializer
     permission_classes = [permissions.AllowAny]
+    cache_name = 'categories'
     
     def get_queryset(self):
-        return Category.objects.filter(is_active=True).prefetch_related('subcategories')
+        return annotate_categories(Category.objects.filter(is_active=True))
 
 
 class CategoryPostListView(generics.ListAPIView):
@@ -143,31 +327,34 @@ class CategoryPostListView(generics.ListAPIView):
     """
     serializer_class = PostListSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = PostListPagination
     
     def get_queryset(self):
         category_slug = self.kwargs['slug']
-        category = get_object_or_404(Category, slug=category_slug, is_active=True)
+        category = get_object_or_404(Category.objects.only('id'), slug=category_slug, is_active=True)
         
-        # Get posts from this category and its subcategories
-        category_ids = [category.id]
-        if category.is_parent:
-            category_ids.extend(category.subcategories.values_list('id', flat=True))
+        # Get posts from this category and its subcategories via a subquery
+        category_ids = Category.objects.filter(Q(id=category.id) | Q(parent_id=category.id)).values('id')
         
-        return Post.objects.filter(
+        queryset = post_list_queryset(Post.objects.filter(
             is_published=True,
             category_id__in=category_ids
-        ).select_related('author', 'category').prefetch_related('tags')
+        ))
+        return annotate_paid_access(queryset, self.request.user)
 
 
-class TagListView(generics.ListAPIView):
+class TagListView(CachedListMixin, generics.ListAPIView):
     """
     List all tags
     """
     serializer_class = TagSerializer
     permission_classes = [permissions.AllowAny]
+    cache_name = 'tags'
     
     def get_queryset(self):
-        return Tag.objects.all()
+        return Tag.objects.annotate(
+            published_posts_count=Count('posts', filter=Q(posts__is_published=True))
+        ).order_by('name')
 
 
 class TagPostListView(generics.ListAPIView):
@@ -176,15 +363,17 @@ class TagPostListView(generics.ListAPIView):
     """
     serializer_class = PostListSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = PostListPagination
     
     def get_queryset(self):
         tag_slug = self.kwargs['slug']
         tag = get_object_or_404(Tag, slug=tag_slug)
         
-        return Post.objects.filter(
+        queryset = post_list_queryset(Post.objects.filter(
             is_published=True,
             tags=tag
-        ).select_related('author', 'category').prefetch_related('tags')
+        ))
+        return annotate_paid_access(queryset, self.request.user)
 
 
 class CheckPaidPostAccessView(APIView):
@@ -194,34 +383,20 @@ class CheckPaidPostAccessView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def post(self, request):
-        serializer = PaidPostAccessSerializer(data=request.data)
+        serializer = PaidPostAccessSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
-            post_id = serializer.validated_data['post_id']
+            # Loaded with its has_paid_order annotation during validation
+            post = serializer.validated_data['post']
+            has_access = post.has_paid_order
             
-            try:
-                post = Post.objects.get(id=post_id, is_published=True)
-                
-                # Check if user has purchased this post
-                has_access = Order.objects.filter(
-                    user=request.user,
-                    post=post,
-                    status='paid'
-                ).exists()
-                
-                return Response({
-                    'post_id': post_id,
-                    'has_access': has_access,
-                    'purchase_required': not has_access,
-                    'price': post.price,
-                    'title': post.title,
-                    'slug': post.slug
-                })
-                
-            except Post.DoesNotExist:
-                return Response(
-                    {'error': 'Post not found'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
+            return Response({
+                'post_id': post.id,
+                'has_access': has_access,
+                'purchase_required': not has_access,
+                'price': post.price,
+                'title': post.title,
+                'slug': post.slug
+            })
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -263,11 +438,8 @@ def post_search(request):
         posts = posts.filter(is_free=False)
     
     # Search
-    posts = posts.filter(
-        Q(title__icontains=query) |
-        Q(excerpt__icontains=query) |
-        Q(content__icontains=query)
-    ).select_related('author', 'category').prefetch_related('tags')[:20]
+    posts = post_list_queryset(search_posts(posts, query))
+    posts = annotate_paid_access(posts, request.user)[:20]
     
     serializer = PostListSerializer(posts, many=True, context={'request': request})
     return Response({'results': serializer.data})
@@ -279,13 +451,20 @@ def featured_posts(request):
     """
     Get featured posts
     """
-    posts = Post.objects.filter(
-        is_published=True,
-        is_featured=True
-    ).select_related('author', 'category').prefetch_related('tags')[:10]
+    def build_results():
+        posts = post_list_queryset(Post.objects.filter(
+            is_published=True,
+            is_featured=True
+        ))
+        posts = annotate_paid_access(posts, request.user)[:10]
+        return PostListSerializer(posts, many=True, context={'request': request}).data
     
-    serializer = PostListSerializer(posts, many=True, context={'request': request})
-    return Response({'results': serializer.data})
+    # is_accessible depends on the user, so only anonymous responses are shared
+    if request.user.is_authenticated:
+        results = build_results()
+    else:
+        results = get_cached_api_data(request, 'featured_posts', build_results)
+    return Response({'results': results})
 
 
 @api_view(['GET'])
@@ -295,9 +474,17 @@ def latest_posts(request):
     Get latest posts
     """
     limit = int(request.GET.get('limit', 10))
-    posts = Post.objects.filter(
-        is_published=True
-    ).select_related('author', 'category').prefetch_related('tags').order_by('-published_at')[:limit]
     
-    serializer = PostListSerializer(posts, many=True, context={'request': request})
-    return Response({'results': serializer.data})
+    def build_results():
+        posts = post_list_queryset(Post.objects.filter(
+            is_published=True
+        )).order_by('-published_at')
+        posts = annotate_paid_access(posts, request.user)[:limit]
+        return PostListSerializer(posts, many=True, context={'request': request}).data
+    
+    # is_accessible depends on the user, so only anonymous responses are shared
+    if request.user.is_authenticated:
+        results = build_results()
+    else:
+        results = get_cached_api_data(request, 'latest_posts', build_results)
+    return Response({'results': results})
@@ -1,5 +1,7 @@
 from django.contrib import admin
+from django.db.models import Count, Q
 from .models import Category, Tag, Post, SavedPost
+from .search import has_full_text_search, search_posts
 
 
 @admin.register(Category)
@@ -11,9 +13,15 @@ class CategoryAdmin(admin.ModelAdmin):
     search_fields = ('name',)
     ordering = ('parent__name', 'order', 'name')
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('parent').annotate(
+            _post_count=Count('posts')
+        )
+    
     def post_count(self, obj):
-        return obj.posts.count()
+        return obj._post_count
     post_count.short_description = 'Posts'
+    post_count.admin_order_field = '_post_count'
 
 
 @admin.register(Tag)
@@ -61,6 +69,18 @@ class PostAdmin(admin.ModelAdmin):
     class Media:
         js = ('admin/js/post_price_handler.js',)
     
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term or not has_full_text_search():
+            return super().get_search_results(request, queryset, search_term)
+        # Body fields go through the full-text index instead of LIKE '%term%'
+        matches = search_posts(Post.objects.all(), search_term).values('pk')
+        queryset = queryset.filter(
+            Q(pk__in=matches) |
+            Q(meta_keywords__icontains=search_term) |
+            Q(focus_keyword__icontains=search_term)
+        )
+        return queryset, False
+    
     def save_model(self, request, obj, form, change):
         # Auto-set is_free based on price
         if obj.price and obj.price > 0:
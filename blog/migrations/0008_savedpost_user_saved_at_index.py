@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-16 05:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_add_views_field'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='savedpost',
+            index=models.Index(fields=['user', '-saved_at'], name='blog_savedp_user_id_4aa849_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+POSTGRES_INDEX_SQL = """
+CREATE INDEX post_search_vector_idx ON blog_post USING GIN ((
+    setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+    setweight(to_tsvector('english', COALESCE(excerpt, '')), 'B') ||
+    setweight(to_tsvector('english', COALESCE(content, '')), 'C')
+))
+"""
+
+MYSQL_INDEX_SQL = 'CREATE FULLTEXT INDEX post_fulltext_idx ON blog_post (title, excerpt, content)'
+
+
+def add_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(POSTGRES_INDEX_SQL)
+    elif vendor == 'mysql':
+        schema_editor.execute(MYSQL_INDEX_SQL)
+
+
+def remove_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS post_search_vector_idx')
+    elif vendor == 'mysql':
+        schema_editor.execute('DROP INDEX post_fulltext_idx ON blog_post')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_savedpost_user_saved_at_index'),
+    ]
+
+    operations = [
+        # Full-text indexes used by blog.search; SQLite keeps substring search
+        migrations.RunPython(add_search_index, remove_search_index),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+# A snapshot of blog.models.count_words
+def count_words(text):
+    return len(text.split())
+
+
+def count_existing_words(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    batch = []
+    for post in Post.objects.only('id', 'content').iterator(chunk_size=200):
+        post.word_count = count_words(post.content)
+        batch.append(post)
+        if len(batch) >= 200:
+            Post.objects.bulk_update(batch, ['word_count'])
+            batch = []
+    if batch:
+        Post.objects.bulk_update(batch, ['word_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_post_content_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_existing_words, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-16 06:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_post_word_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='structured_data_json',
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
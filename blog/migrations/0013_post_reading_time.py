@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-16 06:35
+
+from django.db import migrations, models
+
+
+# A snapshot of blog.models.estimate_reading_time
+def estimate_reading_time(word_count):
+    return max(1, round(word_count / 200))
+
+
+def store_reading_times(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    batch = []
+    for post in Post.objects.only('id', 'word_count', 'reading_time_override').iterator(chunk_size=200):
+        post.reading_time = post.reading_time_override or estimate_reading_time(post.word_count)
+        batch.append(post)
+        if len(batch) >= 200:
+            Post.objects.bulk_update(batch, ['reading_time'])
+            batch = []
+    if batch:
+        Post.objects.bulk_update(batch, ['reading_time'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_structured_data_json'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.RunPython(store_reading_times, migrations.RunPython.noop),
+    ]
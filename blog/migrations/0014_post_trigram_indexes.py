@@ -0,0 +1,31 @@
+from django.db import migrations
+
+POSTGRES_INDEX_SQL = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX post_title_trgm_idx ON blog_post USING GIN (title gin_trgm_ops)',
+    'CREATE INDEX post_excerpt_trgm_idx ON blog_post USING GIN (excerpt gin_trgm_ops)',
+]
+
+
+def add_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for sql in POSTGRES_INDEX_SQL:
+            schema_editor.execute(sql)
+
+
+def remove_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS post_title_trgm_idx')
+        schema_editor.execute('DROP INDEX IF EXISTS post_excerpt_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_post_reading_time'),
+    ]
+
+    operations = [
+        # Trigram indexes for blog.search on PostgreSQL; other backends are untouched
+        migrations.RunPython(add_trigram_indexes, remove_trigram_indexes),
+    ]
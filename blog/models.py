@@ -1,11 +1,92 @@
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.text import slugify
 from django.conf import settings
-import markdown
-import bleach
-from pygments.formatters import HtmlFormatter
+import hashlib
+import json
+import threading
+import time
+import nh3
+
+
+def count_words(text):
+    """Count the whitespace-separated words in ``text``."""
+    return len(text.split())
+
+
+def estimate_reading_time(word_count):
+    """Estimate reading time in minutes (200 words per minute)."""
+    return max(1, round(word_count / 200))
+
+
+MARKDOWN_EXTENSIONS = [
+    'fenced_code',
+    'codehilite',
+    'tables',
+    'toc',
+    'nl2br',
+    'sane_lists',
+]
+MARKDOWN_EXTENSION_CONFIGS = {
+    'codehilite': {
+        'css_class': 'highlight',
+        'linenums': False,
+        # Fences name their language; guessing runs every lexer over each block
+        'guess_lang': False,
+    }
+}
+
+# Sanitize HTML while allowing code blocks and common tags
+ALLOWED_TAGS = frozenset([
+    'p', 'br', 'strong', 'em', 'u', 's', 'blockquote',
+    'ul', 'ol', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'pre', 'code', 'div', 'span', 'a', 'img', 'table',
+    'thead', 'tbody', 'tr', 'th', 'td', 'hr',
+])
+ALLOWED_ATTRS = {
+    '*': ['class', 'id'],
+    'a': ['href', 'title', 'target', 'rel'],
+    'img': ['src', 'alt', 'title', 'width', 'height'],
+}
+
+# Compiled once; the cleaner is immutable and safe to share between threads.
+# link_rel=None keeps the rel attribute authors set instead of overriding it.
+HTML_CLEANER = nh3.Cleaner(
+    tags=set(ALLOWED_TAGS),
+    attributes={tag: set(attrs) for tag, attrs in ALLOWED_ATTRS.items()},
+    link_rel=None,
+    url_schemes={'http', 'https', 'mailto'},
+)
+
+# Markdown instances keep per-document state, so one per thread
+_renderers = threading.local()
+
+
+def render_content_html(text):
+    """Convert Markdown content to safe HTML with syntax highlighting."""
+    if not hasattr(_renderers, 'markdown'):
+        # Imported on first render so startup doesn't pay for Markdown's setup
+        import markdown
+        
+        _renderers.markdown = markdown.Markdown(
+            extensions=MARKDOWN_EXTENSIONS,
+            extension_configs=MARKDOWN_EXTENSION_CONFIGS,
+        )
+    
+    html = _renderers.markdown.reset().convert(text)
+    return HTML_CLEANER.clean(html)
+
+
+SIDEBAR_CATEGORIES_CACHE_KEY = 'blog:parent_cats_v1'
+SIDEBAR_CATEGORIES_CACHE_TIMEOUT = 3600  # seconds
+SIDEBAR_TAGS_CACHE_KEY = 'blog:sidebar_tags_v1'
+RELATED_POSTS_CACHE_TIMEOUT = 600  # seconds
+RELATED_POSTS_VERSION_KEY = 'blog:related_version'
 
 
 class Category(models.Model):
@@ -42,7 +123,7 @@ class Category(models.Model):
     
     @property
     def is_parent(self):
-        return self.parent is None
+        return self.parent_id is None
     
     def has_posts(self):
         """Check if category or its subcategories have any published posts."""
@@ -58,15 +139,33 @@ class Category(models.Model):
     @classmethod
     def get_parent_categories(cls):
         """Get all parent categories with their subcategories that have posts."""
-        parents = cls.objects.filter(parent__isnull=True, is_active=True).prefetch_related('subcategories')
-        
-        # Filter to only parents that have posts or have subcategories with posts
-        result = []
-        for parent in parents:
-            if parent.has_posts():
-                result.append(parent)
-        
-        return result
+        # Only parents that have posts or have subcategories with posts, in one query
+        published_posts = Post.objects.filter(
+            models.Q(category_id=models.OuterRef('pk')) | models.Q(category__parent_id=models.OuterRef('pk')),
+            is_published=True
+        )
+        return list(
+            cls.objects.filter(parent__isnull=True, is_active=True)
+            .filter(models.Exists(published_posts))
+            .prefetch_related('subcategories')
+        )
+    
+    @classmethod
+    def get_sidebar_categories(cls):
+        """Cached plain-dict version of get_parent_categories() for the sidebar."""
+        def build():
+            return [
+                {
+                    'name': parent.name,
+                    'slug': parent.slug,
+                    'subcategories': [
+                        {'name': sub.name, 'slug': sub.slug, 'is_active': sub.is_active}
+                        for sub in parent.subcategories.all()
+                    ],
+                }
+                for parent in cls.get_parent_categories()
+            ]
+        return cache.get_or_set(SIDEBAR_CATEGORIES_CACHE_KEY, build, SIDEBAR_CATEGORIES_CACHE_TIMEOUT)
 
 
 class Tag(models.Model):
@@ -89,6 +188,13 @@ class Tag(models.Model):
     
     def get_absolute_url(self):
         return reverse('blog:tag_posts', kwargs={'slug': self.slug})
+    
+    @classmethod
+    def get_sidebar_tags(cls):
+        """Cached plain-dict list of all tags for the sidebar."""
+        def build():
+            return list(cls.objects.values('name', 'slug'))
+        return cache.get_or_set(SIDEBAR_TAGS_CACHE_KEY, build, SIDEBAR_CATEGORIES_CACHE_TIMEOUT)
 
 
 class Post(models.Model):
@@ -104,6 +210,15 @@ class Post(models.Model):
     slug = models.SlugField(max_length=255, unique=True, blank=True)
     excerpt = models.TextField(max_length=500, help_text='Short summary for cards and SEO')
     content = models.TextField(help_text='Write in Markdown format')
+    # Rendered from content on save; content_hash tracks what was rendered
+    content_html = models.TextField(blank=True, editable=False)
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
+    # JSON-LD for the detail page, rebuilt by saves that change what it reads
+    structured_data_json = models.TextField(blank=True, editable=False)
+    # Counted from content on save so reading_time doesn't need the body
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    # Minutes, from reading_time_override or word_count; kept as a column for ordering
+    reading_time = models.PositiveIntegerField(default=1, editable=False)
     
     # SEO fields (all optional to preserve existing posts)
     seo_title = models.CharField(
@@ -201,6 +316,36 @@ class Post(models.Model):
     
     class Meta:
         ordering = ['-published_at', '-created_at']
+        indexes = [
+            # Unconditional, since MySQL ignores partial indexes; one per list query
+            # Trailing -id matches POST_KEYSET_ORDERING so list pages walk the index
+            models.Index(fields=['is_published', '-published_at', '-id'], name='post_pub_date_id_idx'),
+            models.Index(
+                fields=['is_published', 'is_free', '-published_at'],
+                name='post_pub_free_date_idx',
+            ),
+            models.Index(
+                fields=['is_published', 'is_featured', '-published_at'],
+                name='post_pub_featured_date_idx',
+            ),
+            models.Index(
+                fields=['category', 'is_published', '-published_at'],
+                name='post_category_pub_date_idx',
+            ),
+            models.Index(
+                fields=['post_type', 'is_published', '-published_at'],
+                name='post_type_pub_date_idx',
+            ),
+        ]
+    
+    # Columns save() recomputes from content
+    CONTENT_DERIVED_FIELDS = ('word_count', 'reading_time', 'content_html', 'content_hash')
+    # Fields read by _build_structured_data()
+    STRUCTURED_DATA_SOURCE_FIELDS = frozenset({
+        'schema_type', 'title', 'seo_title', 'excerpt', 'meta_description', 'author',
+        'published_at', 'updated_at', 'slug', 'cover_image', 'og_image_alt',
+        'focus_keyword', 'meta_keywords',
+    })
     
     def __str__(self):
         return self.title
@@ -210,23 +355,73 @@ class Post(models.Model):
             self.slug = slugify(self.title)
         if self.is_published and not self.published_at:
             self.published_at = timezone.now()
+        # Partial saves that leave content alone skip the word count and render
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            self.word_count = count_words(self.content)
+            self.refresh_content_html()
+        self.reading_time = self.reading_time_override or estimate_reading_time(self.word_count)
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if 'content' in update_fields:
+                update_fields.update(self.CONTENT_DERIVED_FIELDS)
+            if 'reading_time_override' in update_fields:
+                update_fields.add('reading_time')
+            kwargs['update_fields'] = update_fields
         super().save(*args, **kwargs)
+        # Built after the save so dateModified matches the stored updated_at
+        if update_fields is None or not update_fields.isdisjoint(self.STRUCTURED_DATA_SOURCE_FIELDS):
+            self.refresh_structured_data()
+    
+    def refresh_content_html(self):
+        """Re-render content_html if content changed since it was last rendered."""
+        content_hash = hashlib.sha256(self.content.encode('utf-8')).hexdigest()
+        if content_hash != self.content_hash:
+            self.content_html = self._render_content_html()
+            self.content_hash = content_hash
+    
+    def refresh_structured_data(self):
+        """Rebuild and store structured_data_json from the saved post."""
+        self.structured_data_json = self._build_structured_data()
+        Post.objects.filter(pk=self.pk).update(structured_data_json=self.structured_data_json)
     
     def get_absolute_url(self):
         return reverse('blog:post_detail', kwargs={'slug': self.slug})
     
-    @property
-    def reading_time(self):
-        """Estimate reading time in minutes."""
-        if self.reading_time_override:
-            return self.reading_time_override
-        word_count = len(self.content.split())
-        minutes = max(1, round(word_count / 200))
-        return minutes
+    def get_related_posts(self, tag_ids):
+        """Cached plain-dict cards for up to three published posts sharing a tag."""
+        if not tag_ids:
+            return []
+        
+        def build():
+            related = Post.objects.filter(
+                is_published=True,
+                tags__in=tag_ids
+            ).exclude(id=self.id).distinct().only(
+                'id', 'slug', 'title', 'excerpt', 'is_free'
+            ).prefetch_related('tags')[:3]
+            return [
+                {
+                    'url': post.get_absolute_url(),
+                    'title': post.title,
+                    'excerpt': post.excerpt,
+                    'is_free': post.is_free,
+                    'tag_name': next((tag.name for tag in post.tags.all()), None),
+                }
+                for post in related
+            ]
+        
+        # Any post or tag change starts a new generation of related-post keys
+        version = cache.get_or_set(RELATED_POSTS_VERSION_KEY, time.time_ns, None)
+        return cache.get_or_set(f'blog:related:{version}:{self.id}', build, RELATED_POSTS_CACHE_TIMEOUT)
     
     @property
     def save_count(self):
         """Return the number of users who have saved this post."""
+        # List views annotate saved_by_count to avoid a COUNT per card
+        saved_by_count = getattr(self, 'saved_by_count', None)
+        if saved_by_count is not None:
+            return saved_by_count
         return self.saved_by.count()
     
     @property
@@ -239,11 +434,11 @@ class Post(models.Model):
         """Return meta description or fallback to excerpt."""
         return self.meta_description or self.excerpt
     
-    @property
+    @cached_property
     def get_keywords_list(self):
-        """Return keywords as a list."""
+        """Return keywords as a list; templates read it more than once per render."""
         if self.meta_keywords:
-            return [kw.strip() for kw in self.meta_keywords.split(',') if kw.strip()]
+            return [kw for kw in (part.strip() for part in self.meta_keywords.split(',')) if kw]
         return []
     
     @property
@@ -252,11 +447,12 @@ class Post(models.Model):
         return self.canonical_url or self.get_absolute_url()
     
     def get_structured_data(self):
-        """Generate JSON-LD structured data for the post."""
-        import json
-        from django.urls import reverse
-        from django.utils.html import strip_tags
-        
+        """Return JSON-LD structured data for the post."""
+        # Posts not saved since structured_data_json was added, or whose
+        # author was renamed, are built per render until their next save
+        return self.structured_data_json or self._build_structured_data()
+    
+    def _build_structured_data(self):
         data = {
             "@context": "https://schema.org",
             "@type": self.schema_type,
@@ -286,50 +482,10 @@ class Post(models.Model):
         elif self.meta_keywords:
             data["keywords"] = self.meta_keywords
         
-        return json.dumps(data, indent=2)
+        return json.dumps(data, separators=(',', ':'))
     
-    @property
-    def content_html(self):
-        """Convert Markdown content to safe HTML with syntax highlighting."""
-        # Configure markdown with extensions
-        md = markdown.Markdown(extensions=[
-            'fenced_code',
-            'codehilite',
-            'tables',
-            'toc',
-            'nl2br',
-            'sane_lists',
-        ], extension_configs={
-            'codehilite': {
-                'css_class': 'highlight',
-                'linenums': False,
-                'guess_lang': True,
-            }
-        })
-        
-        html = md.convert(self.content)
-        
-        # Sanitize HTML while allowing code blocks and common tags
-        allowed_tags = [
-            'p', 'br', 'strong', 'em', 'u', 's', 'blockquote',
-            'ul', 'ol', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
-            'pre', 'code', 'div', 'span', 'a', 'img', 'table',
-            'thead', 'tbody', 'tr', 'th', 'td', 'hr',
-        ]
-        allowed_attrs = {
-            '*': ['class', 'id'],
-            'a': ['href', 'title', 'target', 'rel'],
-            'img': ['src', 'alt', 'title', 'width', 'height'],
-        }
-        
-        clean_html = bleach.clean(
-            html,
-            tags=allowed_tags,
-            attributes=allowed_attrs,
-            strip=True
-        )
-        
-        return clean_html
+    def _render_content_html(self):
+        return render_content_html(self.content)
     
     @property
     def is_locked(self):
@@ -355,7 +511,36 @@ class SavedPost(models.Model):
     class Meta:
         unique_together = ('user', 'post')
         ordering = ['-saved_at']
+        indexes = [
+            models.Index(fields=['user', '-saved_at']),
+        ]
     
     def __str__(self):
         return f"{self.user.email} saved {self.post.title}"
 
+
+# Signals to rebuild the cached sidebar data
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_sidebar_categories(sender, **kwargs):
+    cache.delete(SIDEBAR_CATEGORIES_CACHE_KEY)
+
+
+@receiver([post_save, post_delete], sender=Tag)
+def invalidate_sidebar_tags(sender, **kwargs):
+    cache.delete(SIDEBAR_TAGS_CACHE_KEY)
+
+
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=Tag)
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_related_posts(sender, **kwargs):
+    cache.set(RELATED_POSTS_VERSION_KEY, time.time_ns(), None)
+
+
+# Post JSON-LD embeds the author's name; renders rebuild it until the post is saved
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def clear_author_structured_data(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and not {'full_name', 'email'} & set(update_fields)):
+        return
+    Post.objects.filter(author_id=instance.pk).exclude(structured_data_json='').update(structured_data_json='')
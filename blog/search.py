@@ -0,0 +1,91 @@
+"""
+Full-text search for blog posts.
+
+Uses the database's own full-text engine where one is available and falls
+back to substring matching elsewhere (e.g. SQLite in development):
+
+- PostgreSQL: weighted ``SearchVector`` over title/excerpt/content, backed by
+  the GIN expression index from migration 0009, plus ``pg_trgm`` similarity on
+  title/excerpt (migration 0014) so partial words and typos still match.
+- MySQL: boolean-mode ``MATCH ... AGAINST`` against the FULLTEXT index from
+  migration 0009, with every word as a prefix so partial words match. InnoDB
+  skips words shorter than ``innodb_ft_min_token_size`` and stopwords, so
+  queries with short words, or with no full-text hits, use substring matching.
+"""
+import re
+
+from django.db import connection
+from django.db.models import F, FloatField, Func, Q, Value
+
+SEARCH_CONFIG = 'english'
+# InnoDB's default innodb_ft_min_token_size
+MYSQL_FT_MIN_TOKEN_SIZE = 3
+
+
+class MatchAgainst(Func):
+    """
+    MySQL ``MATCH (columns) AGAINST (query)`` relevance. Columns are compiled
+    like any other expression, so table aliases in subqueries resolve.
+    """
+    template = '%(function)s (%(expressions)s) AGAINST (%(query)s IN BOOLEAN MODE)'
+    function = 'MATCH'
+    output_field = FloatField()
+
+    def __init__(self, *columns, query):
+        super().__init__(*columns)
+        self.query = Value(query)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        query_sql, query_params = compiler.compile(self.query)
+        sql, params = super().as_sql(compiler, connection, query=query_sql, **extra_context)
+        return sql, (*params, *query_params)
+
+
+def has_full_text_search():
+    """Whether the current database has a full-text index for posts."""
+    return connection.vendor in ('postgresql', 'mysql')
+
+
+def post_search_vector():
+    """Weighted search vector matching the post_search_vector_idx expression."""
+    from django.contrib.postgres.search import SearchVector
+
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG) +
+        SearchVector('excerpt', weight='B', config=SEARCH_CONFIG) +
+        SearchVector('content', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def search_posts(queryset, query):
+    """Filter a Post queryset by ``query``, best matches first where ranked."""
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.lookups import TrigramSimilar
+        from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+
+        search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+        return queryset.annotate(
+            search=post_search_vector(),
+        ).filter(
+            Q(search=search_query) |
+            Q(TrigramSimilar(F('title'), query)) |
+            Q(TrigramSimilar(F('excerpt'), query))
+        ).annotate(
+            rank=SearchRank(post_search_vector(), search_query) + TrigramSimilarity('title', query),
+        ).order_by('-rank', '-published_at')
+
+    if connection.vendor == 'mysql':
+        # Operators are stripped from the words, which then match as prefixes
+        words = re.findall(r'\w+', query)
+        if words and all(len(word) >= MYSQL_FT_MIN_TOKEN_SIZE for word in words):
+            matches = queryset.annotate(
+                relevance=MatchAgainst('title', 'excerpt', 'content', query=' '.join(f'{word}*' for word in words)),
+            ).filter(relevance__gt=0).order_by('-relevance', '-published_at')
+            if matches.exists():
+                return matches
+
+    return queryset.filter(
+        Q(title__icontains=query) |
+        Q(excerpt__icontains=query) |
+        Q(content__icontains=query)
+    )
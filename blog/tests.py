@@ -1,3 +1,125 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.query import QuerySet
+from django.test import RequestFactory, TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Post, SavedPost
+from .views import decode_post_cursor, encode_post_cursor, paginate_posts
+
+User = get_user_model()
+
+
+class PostCursorTests(TestCase):
+    """Keyset pagination cursors."""
+
+    def setUp(self):
+        # CachedCountPaginator keeps list counts in the cache between tests
+        cache.clear()
+
+    def test_round_trip(self):
+        post = Post(id=42, published_at=timezone.now())
+        self.assertEqual(decode_post_cursor(encode_post_cursor(post)), (post.published_at, 42))
+
+    def test_malformed_cursors_decode_to_none(self):
+        for cursor in [
+            '',
+            'garbage',
+            '_5',
+            'not-a-date_5',
+            '2026-13-45T00:00:00_3',
+            '2026-01-01T00:00:00+00:00_',
+            '2026-01-01T00:00:00+00:00_abc',
+            '2026-01-01T00:00:00+00:00_-1',
+        ]:
+            with self.subTest(cursor=cursor):
+                self.assertIsNone(decode_post_cursor(cursor))
+
+    def test_posts_without_published_at_are_left_out_of_keyset_pages(self):
+        now = timezone.now()
+        for i in range(11):
+            Post.objects.create(
+                title=f'Post {i}', content='Body', excerpt='Excerpt',
+                is_published=True, published_at=now - timedelta(days=i)
+            )
+        # Published through .update(), which skips Post.save() and published_at;
+        # NULLs sort after the dated posts and would end the first page
+        Post.objects.filter(title__in=['Post 0', 'Post 1', 'Post 2']).update(published_at=None)
+
+        request = RequestFactory().get('/blog/')
+        page, next_cursor = paginate_posts(request, Post.objects.filter(is_published=True))
+        self.assertEqual([post.title for post in page], [f'Post {i}' for i in range(3, 11)])
+        self.assertIsNone(next_cursor)
+
+    def test_cursor_pages(self):
+        now = timezone.now()
+        for i in range(12):
+            Post.objects.create(
+                title=f'Post {i}', content='Body', excerpt='Excerpt',
+                is_published=True, published_at=now - timedelta(days=i)
+            )
+
+        request = RequestFactory().get('/blog/')
+        page, next_cursor = paginate_posts(request, Post.objects.filter(is_published=True))
+        self.assertEqual(len(page), 9)
+
+        request = RequestFactory().get('/blog/', {'after': next_cursor})
+        page, next_cursor = paginate_posts(request, Post.objects.filter(is_published=True))
+        self.assertEqual([post.title for post in page], ['Post 9', 'Post 10', 'Post 11'])
+        self.assertIsNone(next_cursor)
+
+
+class ToggleSavePostTests(TestCase):
+    """The save/unsave endpoint."""
+
+    ajax = {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='reader@example.com', password='secret')
+        self.post = Post.objects.create(
+            title='Saved post', content='Body', excerpt='Excerpt', is_published=True
+        )
+        self.client.force_login(self.user)
+        self.url = reverse('blog:toggle_save', args=[self.post.id])
+
+    def saved_rows(self):
+        return SavedPost.objects.filter(user=self.user, post=self.post).count()
+
+    def test_toggle_keeps_at_most_one_row(self):
+        for expected in [True, False, True]:
+            response = self.client.post(self.url, **self.ajax)
+            self.assertEqual(response.json(), {'saved': expected})
+            self.assertEqual(self.saved_rows(), int(expected))
+
+    def test_concurrent_save_reports_saved(self):
+        SavedPost.objects.create(user=self.user, post=self.post)
+        # Another request saved the post between our delete and insert
+        with mock.patch.object(QuerySet, 'delete', return_value=(0, {})):
+            response = self.client.post(self.url, **self.ajax)
+        self.assertEqual(response.json(), {'saved': True})
+        self.assertEqual(self.saved_rows(), 1)
+
+    def test_requires_post(self):
+        response = self.client.get(self.url, **self.ajax)
+        self.assertEqual(response.status_code, 405)
+
+
+class ToggleSaveMissingPostTests(TransactionTestCase):
+    """
+    The missing post is caught by the foreign key check when the toggle
+    commits, which a TestCase transaction would defer past the request.
+    """
+
+    def test_missing_post(self):
+        user = User.objects.create_user(email='reader@example.com', password='secret')
+        self.client.force_login(user)
+        response = self.client.post(
+            reverse('blog:toggle_save', args=[1000]), HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {'error': 'Post not found'})
+        self.assertFalse(SavedPost.objects.exists())
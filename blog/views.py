@@ -1,31 +1,121 @@
 from django.shortcuts import render, get_object_or_404, redirect
-from django.core.paginator import Paginator
-from django.db.models import Q, F
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
+from django.utils.dateparse import parse_datetime
 from django.views.decorators.http import require_POST
 from django.contrib import messages
 from django.core.exceptions import ValidationError
 import logging
 
 from .models import Post, Tag, Category, SavedPost
+from .search import search_posts
+from accounts.models import Profile
+from core.pagination import CachedCountPaginator
 from orders.utils import user_has_post_access
 
 logger = logging.getLogger('blog')
 
+POST_VIEW_WINDOW = 600  # seconds before the same visitor's view counts again
+
+POSTS_PER_PAGE = 9
+# Stable order for keyset pagination; id breaks published_at ties
+POST_KEYSET_ORDERING = ('-published_at', '-id')
+
+
+# Columns rendered by blog/_post_card.html
+POST_CARD_FIELDS = (
+    'id', 'slug', 'title', 'excerpt', 'cover_image', 'published_at', 'is_free',
+    'post_type', 'views', 'reading_time',
+    'category__id', 'category__name', 'category__slug',
+)
+
+
+def post_card_queryset(queryset, user):
+    """
+    Join the category, prefetch tags and load only the post card columns,
+    with the save count and the user's is_saved flag annotated.
+    """
+    # A correlated subquery, since a Count() join would group the list query
+    saved_by_count = SavedPost.objects.filter(
+        post=OuterRef('pk')
+    ).order_by().values('post').annotate(count=Count('pk')).values('count')
+    queryset = queryset.select_related('category').prefetch_related('tags').only(
+        *POST_CARD_FIELDS
+    ).annotate(saved_by_count=Coalesce(Subquery(saved_by_count), 0))
+    if user.is_authenticated:
+        queryset = queryset.annotate(
+            is_saved=Exists(SavedPost.objects.filter(user=user, post=OuterRef('pk')))
+        )
+    return queryset
+
+
+def encode_post_cursor(post):
+    """Cursor pointing just past ``post`` in POST_KEYSET_ORDERING."""
+    return f'{post.published_at.isoformat()}_{post.id}'
+
+
+def decode_post_cursor(cursor):
+    """Return (published_at, id) from a cursor, or None if it is malformed."""
+    published_at, _, post_id = cursor.rpartition('_')
+    try:
+        published_at = parse_datetime(published_at)
+    except ValueError:
+        return None
+    if published_at is None or not post_id.isdigit():
+        return None
+    return published_at, int(post_id)
+
+
+def paginate_posts(request, posts, keyset=True):
+    """
+    Paginate a post list, returning ``(posts, next_cursor)``.
+    
+    ``?page=N`` serves the numbered links. With ``keyset`` the next page link
+    carries an ``?after=<cursor>`` instead, which seeks past the last post
+    shown rather than counting through an OFFSET. Ranked search results
+    have no stable seek key and always use page numbers.
+    """
+    if not keyset:
+        paginator = CachedCountPaginator(posts, POSTS_PER_PAGE)
+        return paginator.get_page(request.GET.get('page', 1)), None
+    
+    # Rows published through .update() or bulk actions can lack published_at,
+    # which has no place in the keyset order or a cursor
+    posts = posts.filter(published_at__isnull=False).order_by(*POST_KEYSET_ORDERING)
+    after = request.GET.get('after')
+    if after is None:
+        page = CachedCountPaginator(posts, POSTS_PER_PAGE).get_page(request.GET.get('page', 1))
+        next_cursor = encode_post_cursor(page[-1]) if page.has_next() else None
+        return page, next_cursor
+    
+    # Malformed cursors start from the newest post
+    cursor = decode_post_cursor(after)
+    if cursor:
+        published_at, post_id = cursor
+        posts = posts.filter(
+            Q(published_at__lt=published_at) |
+            Q(published_at=published_at, id__lt=post_id)
+        )
+    page = list(posts[:POSTS_PER_PAGE + 1])
+    next_cursor = None
+    if len(page) > POSTS_PER_PAGE:
+        page = page[:POSTS_PER_PAGE]
+        next_cursor = encode_post_cursor(page[-1])
+    return page, next_cursor
+
 
 def post_list(request):
     """List all published blog posts with search and filtering."""
-    posts = Post.objects.filter(is_published=True)
+    posts = post_card_queryset(Post.objects.filter(is_published=True), request.user)
     
     # Search functionality
     query = request.GET.get('q', '')
     if query:
-        posts = posts.filter(
-            Q(title__icontains=query) |
-            Q(excerpt__icontains=query) |
-            Q(content__icontains=query)
-        )
+        posts = search_posts(posts, query)
     
     # Filter by type
     post_type = request.GET.get('type', '')
@@ -51,28 +141,22 @@ def post_list(request):
         posts = posts.filter(is_free=False)
     
     # Featured posts
-    featured_posts = Post.objects.filter(is_published=True, is_featured=True)[:3]
+    featured_posts = post_card_queryset(
+        Post.objects.filter(is_published=True, is_featured=True), request.user
+    )[:3]
     
     # Pagination
-    paginator = Paginator(posts, 9)
-    page = request.GET.get('page', 1)
-    posts = paginator.get_page(page)
+    posts, next_cursor = paginate_posts(request, posts, keyset=not query)
     
     # Get all tags for filter sidebar
-    tags = Tag.objects.all()
+    tags = Tag.get_sidebar_tags()
     
     # Get parent categories with subcategories for sidebar
-    categories = Category.get_parent_categories()
-    
-    # Get user's saved posts if authenticated
-    saved_post_ids = []
-    if request.user.is_authenticated:
-        saved_post_ids = list(
-            SavedPost.objects.filter(user=request.user).values_list('post_id', flat=True)
-        )
+    categories = Category.get_sidebar_categories()
     
     context = {
         'posts': posts,
+        'next_cursor': next_cursor,
         'featured_posts': featured_posts,
         'tags': tags,
         'categories': categories,
@@ -80,7 +164,6 @@ def post_list(request):
         'query': query,
         'post_type': post_type,
         'access': access,
-        'saved_post_ids': saved_post_ids,
     }
     return render(request, 'blog/post_list.html', context)
 
@@ -88,53 +171,51 @@ def post_list(request):
 def post_detail(request, slug):
     """Display a single blog post."""
     try:
-        logger.debug(f"Accessing post detail for slug: {slug}")
+        logger.debug("Accessing post detail for slug: %s", slug)
         
-        post = get_object_or_404(Post, slug=slug, is_published=True)
+        posts = Post.objects.filter(is_published=True)
+        if request.user.is_authenticated:
+            # Load the saved state with the post instead of a separate EXISTS query
+            posts = posts.annotate(
+                is_saved=Exists(SavedPost.objects.filter(user=request.user, post=OuterRef('pk')))
+            )
+        post = get_object_or_404(posts, slug=slug)
         
-        # Increment view count
-        Post.objects.filter(id=post.id).update(views=F('views') + 1)
-        # Refresh from database to get updated view count
-        post.refresh_from_db()
+        # Count one view per visitor per post within the window
+        view_key = f"blog:viewed:{post.id}:{request.META.get('REMOTE_ADDR', '')}"
+        if cache.add(view_key, 1, POST_VIEW_WINDOW):
+            Post.objects.filter(id=post.id).update(views=F('views') + 1)
+            post.views += 1
         
         # Check if user has access to paid content
         has_access = user_has_post_access(request.user, post)
-        is_saved = False
-        
-        if request.user.is_authenticated:
-            try:
-                # Check if post is saved
-                is_saved = SavedPost.objects.filter(user=request.user, post=post).exists()
-                logger.debug(f"Post {slug} save status for user {request.user.email}: {is_saved}")
-            except Exception as e:
-                logger.error(f"Error checking saved status for post {slug}, user {request.user.email}: {str(e)}")
-                # Continue without failing the whole view
-                is_saved = False
+        is_saved = getattr(post, 'is_saved', False)
 
+        # Tags are rendered in several places; load them once
+        post_tags = list(post.tags.all())
+        
         # Related posts (same tags, excluding current)
         try:
-            related_posts = Post.objects.filter(
-                is_published=True,
-                tags__in=post.tags.all()
-            ).exclude(id=post.id).distinct()[:3]
-            logger.debug(f"Found {len(related_posts)} related posts for {slug}")
+            related_posts = post.get_related_posts([tag.id for tag in post_tags])
+            logger.debug("Found %s related posts for %s", len(related_posts), slug)
         except Exception as e:
-            logger.error(f"Error fetching related posts for {slug}: {str(e)}")
+            logger.error("Error fetching related posts for %s: %s", slug, e)
             related_posts = []
 
         context = {
             'post': post,
+            'post_tags': post_tags,
             'has_access': has_access,
             'is_saved': is_saved,
             'related_posts': related_posts,
             'structured_data': post.get_structured_data(),
         }
         
-        logger.debug(f"Successfully rendered post detail for {slug}")
+        logger.debug("Successfully rendered post detail for %s", slug)
         return render(request, 'blog/post_detail.html', context)
         
     except Exception as e:
-        logger.error(f"Unexpected error in post_detail for slug {slug}: {str(e)}")
+        logger.error("Unexpected error in post_detail for slug %s: %s", slug, e)
         logger.exception("Full traceback:")
         messages.error(request, "An error occurred while loading the post.")
         return redirect('blog:post_list')
@@ -143,88 +224,85 @@ def post_detail(request, slug):
 def tag_posts(request, slug):
     """List posts filtered by tag."""
     tag = get_object_or_404(Tag, slug=slug)
-    posts = Post.objects.filter(is_published=True, tags=tag)
+    posts = post_card_queryset(Post.objects.filter(is_published=True, tags=tag), request.user)
     
     # Pagination
-    paginator = Paginator(posts, 9)
-    page = request.GET.get('page', 1)
-    posts = paginator.get_page(page)
-    
-    # Get user's saved posts if authenticated
-    saved_post_ids = []
-    if request.user.is_authenticated:
-        saved_post_ids = list(
-            SavedPost.objects.filter(user=request.user).values_list('post_id', flat=True)
-        )
+    posts, next_cursor = paginate_posts(request, posts)
     
     context = {
         'tag': tag,
         'posts': posts,
-        'saved_post_ids': saved_post_ids,
+        'next_cursor': next_cursor,
     }
     return render(request, 'blog/tag_posts.html', context)
 
 
 
+def _bump_saved_counter(user_id, delta):
+    """Adjust the user's saved tutorials count by ``delta`` in one UPDATE."""
+    try:
+        profiles = Profile.objects.filter(user_id=user_id)
+        if delta < 0:
+            profiles = profiles.filter(saved_tutorials_count__gt=0)
+        profiles.update(saved_tutorials_count=F('saved_tutorials_count') + delta)
+    except Exception as e:
+        # Don't fail the toggle for this
+        logger.error("Failed to update saved count for user %s: %s", user_id, e)
+
+
 @login_required
 @require_POST
 def toggle_save_post(request, post_id):
     """Toggle save/unsave a post (AJAX endpoint)."""
+    is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
     try:
-        logger.debug(f"User {request.user.email} attempting to toggle save for post {post_id}")
+        logger.debug("User %s attempting to toggle save for post %s", request.user, post_id)
         
-        post = get_object_or_404(Post, id=post_id)
-        
-        # Check if user has a profile
-        if not hasattr(request.user, 'profile'):
-            logger.error(f"User {request.user.email} has no profile - this should not happen")
-            messages.error(request, "Profile error. Please contact support.")
-            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-                return JsonResponse({'error': 'Profile not found'}, status=400)
-            return redirect(post.get_absolute_url())
-        
-        saved, created = SavedPost.objects.get_or_create(
-            user=request.user,
-            post=post
-        )
-        
-        if not created:
-            # Already saved, so unsave it
-            saved.delete()
-            is_saved = False
-            logger.debug(f"Post {post_id} unsaved by user {request.user.email}")
-        else:
-            is_saved = True
-            logger.debug(f"Post {post_id} saved by user {request.user.email}")
-        
-        # Update user's saved count
+        # Toggle by IDs alone; the post row is only read for the redirect
+        user_id = request.user.id
         try:
-            saved_count = SavedPost.objects.filter(user=request.user).count()
-            request.user.profile.saved_tutorials_count = saved_count
-            request.user.profile.save()
-            logger.debug(f"Updated saved count for user {request.user.email}: {saved_count}")
-        except Exception as e:
-            logger.error(f"Failed to update saved count for user {request.user.email}: {str(e)}")
-            # Don't fail the whole operation for this
+            with transaction.atomic():
+                # Unsave if already saved; the delete doubles as the existence check
+                deleted, _ = SavedPost.objects.filter(user_id=user_id, post_id=post_id).delete()
+                if deleted:
+                    is_saved = False
+                    logger.debug("Post %s unsaved by user %s", post_id, request.user)
+                else:
+                    # The post foreign key rejects IDs that don't exist
+                    SavedPost.objects.create(user_id=user_id, post_id=post_id)
+                    is_saved = True
+                    logger.debug("Post %s saved by user %s", post_id, request.user)
+                
+                # Profiles are created with the user; a missing one just updates nothing
+                delta = 1 if is_saved else -1
+                transaction.on_commit(lambda: _bump_saved_counter(user_id, delta))
+        except IntegrityError:
+            # Either the post doesn't exist or a concurrent request saved it first
+            if not Post.objects.filter(id=post_id).exists():
+                raise Post.DoesNotExist
+            is_saved = True
         
-        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        if is_ajax:
             return JsonResponse({'saved': is_saved})
         
         messages.success(request, f"Post {'saved' if is_saved else 'removed from saved'}")
-        return redirect(post.get_absolute_url())
+        slug = Post.objects.filter(id=post_id).values_list('slug', flat=True).first()
+        if slug is None:
+            return redirect('blog:post_list')
+        return redirect('blog:post_detail', slug=slug)
         
     except Post.DoesNotExist:
-        logger.error(f"User {request.user.email} tried to save non-existent post {post_id}")
-        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        logger.error("User %s tried to save non-existent post %s", request.user, post_id)
+        if is_ajax:
             return JsonResponse({'error': 'Post not found'}, status=404)
         messages.error(request, "Post not found.")
         return redirect('blog:post_list')
         
     except Exception as e:
-        logger.error(f"Unexpected error in toggle_save_post for user {request.user.email}, post {post_id}: {str(e)}")
+        logger.error("Unexpected error in toggle_save_post for user %s, post %s: %s", request.user, post_id, e)
         logger.exception("Full traceback:")
         
-        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        if is_ajax:
             return JsonResponse({'error': 'An unexpected error occurred'}, status=500)
         
         messages.error(request, "An error occurred. Please try again.")
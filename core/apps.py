@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'core'
+    
+    def ready(self):
+        # Register cache invalidation signal handlers
+        from . import cache  # noqa: F401
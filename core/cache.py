@@ -0,0 +1,19 @@
+"""
+Caching for the home page content sections
+"""
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+HOME_CACHE_TIMEOUT = 300  # seconds
+HOME_CONTENT_FRAGMENT = 'home_content'
+
+
+# Signals to drop the cached courses/tutorials sections when their content changes
+@receiver([post_save, post_delete], sender='blog.Post')
+@receiver([post_save, post_delete], sender='blog.Category')
+@receiver([post_save, post_delete], sender='courses.Course')
+@receiver([post_save, post_delete], sender='courses.Lesson')
+def invalidate_home_content(sender, **kwargs):
+    cache.delete(make_template_fragment_key(HOME_CONTENT_FRAGMENT))
@@ -0,0 +1,25 @@
+import hashlib
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator that caches the COUNT(*) of its object list for a short time."""
+    
+    count_timeout = 60  # seconds
+    
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is None:
+            return super().count
+        try:
+            sql = str(query)
+        except EmptyResultSet:
+            # e.g. queryset.none(); nothing to count
+            return 0
+        key = 'paginator_count:' + hashlib.md5(sql.encode('utf-8')).hexdigest()
+        return cache.get_or_set(key, lambda: super(CachedCountPaginator, self).count, self.count_timeout)
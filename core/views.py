@@ -1,28 +1,42 @@
 from django.shortcuts import render
 from blog.models import Post
-from courses.models import Course
+from courses.models import Course, annotate_lesson_counts
+from .cache import HOME_CACHE_TIMEOUT
+
+
+# Columns rendered by the home page post cards
+HOME_POST_FIELDS = (
+    'id', 'slug', 'title', 'excerpt', 'post_type', 'reading_time',
+    'category__id', 'category__name',
+)
+# Columns rendered by the home page course cards
+HOME_COURSE_FIELDS = ('id', 'title', 'slug', 'description', 'cover_image', 'is_free', 'price')
 
 
 def home(request):
     """Home page view."""
     # Get featured and latest published blog posts
-    featured_posts = Post.objects.filter(
+    posts = Post.objects.select_related('category').only(*HOME_POST_FIELDS)
+    featured_posts = posts.filter(
         is_published=True,
         is_featured=True
     ).order_by('-published_at')[:3]
     
-    latest_posts = Post.objects.filter(
+    latest_posts = posts.filter(
         is_published=True
     ).order_by('-published_at')[:6]
     
     # Get published courses
-    featured_courses = Course.objects.filter(
+    featured_courses = annotate_lesson_counts(Course.objects.filter(
         is_published=True
-    ).order_by('-created_at')[:3]
+    ).only(*HOME_COURSE_FIELDS)).order_by('-created_at')[:3]
     
+    # The querysets are lazy, so they only run when the template's
+    # home_content fragment cache misses
     context = {
         'featured_posts': featured_posts,
         'latest_posts': latest_posts,
         'featured_courses': featured_courses,
+        'home_cache_timeout': HOME_CACHE_TIMEOUT,
     }
     return render(request, 'core/home.html', context)
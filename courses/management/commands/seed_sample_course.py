@@ -90,23 +90,32 @@ class Command(BaseCommand):
             ),
         ]
 
-        created_count = 0
-        for idx, (lesson_title, content) in enumerate(lessons_data, start=1):
-            lesson, lesson_created = Lesson.objects.get_or_create(
+        # Lesson slugs are unique, so skip the ones already seeded and insert
+        # the rest in one query
+        lesson_slugs = [slugify(f"{course.slug}-{lesson_title}") for lesson_title, _ in lessons_data]
+        existing_slugs = set(Lesson.objects.filter(slug__in=lesson_slugs).values_list('slug', flat=True))
+        now = timezone.now()
+        new_lessons = [
+            Lesson(
                 course=course,
-                slug=slugify(f"{course.slug}-{lesson_title}"),
-                defaults={
-                    'title': lesson_title,
-                    'excerpt': content.split("\n", 1)[0][:140],
-                    'content': content.strip(),
-                    'is_published': True,
-                    'is_free': True,
-                    'order': idx,
-                    'published_at': timezone.now(),
-                },
+                slug=slug,
+                title=lesson_title,
+                excerpt=content.split("\n", 1)[0][:140],
+                content=content.strip(),
+                is_published=True,
+                is_free=True,
+                order=idx,
+                published_at=now,
             )
-            if lesson_created:
-                created_count += 1
+            for idx, (slug, (lesson_title, content)) in enumerate(zip(lesson_slugs, lessons_data), start=1)
+            if slug not in existing_slugs
+        ]
+        # bulk_create skips Lesson.save(), which fills the content-derived columns
+        for lesson in new_lessons:
+            lesson.refresh_content_html()
+            lesson.refresh_reading_time()
+        Lesson.objects.bulk_create(new_lessons, ignore_conflicts=True)
+        created_count = len(new_lessons)
 
         self.stdout.write(self.style.SUCCESS(
             f"Seeded course '{course.title}' (created={created}) with {created_count} new lessons."
@@ -0,0 +1,75 @@
+# Generated by Django 4.2.30 on 2026-10-16 06:56
+
+import hashlib
+
+from django.db import migrations, models
+
+
+# A snapshot of blog.models.render_content_html, which lessons share, so later
+# changes to the live renderer don't change what this migration produces
+MARKDOWN_EXTENSIONS = ['fenced_code', 'codehilite', 'tables', 'toc', 'nl2br', 'sane_lists']
+MARKDOWN_EXTENSION_CONFIGS = {
+    'codehilite': {'css_class': 'highlight', 'linenums': False, 'guess_lang': False},
+}
+ALLOWED_TAGS = {
+    'p', 'br', 'strong', 'em', 'u', 's', 'blockquote',
+    'ul', 'ol', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'pre', 'code', 'div', 'span', 'a', 'img', 'table',
+    'thead', 'tbody', 'tr', 'th', 'td', 'hr',
+}
+ALLOWED_ATTRS = {
+    '*': {'class', 'id'},
+    'a': {'href', 'title', 'target', 'rel'},
+    'img': {'src', 'alt', 'title', 'width', 'height'},
+}
+
+
+def make_renderer():
+    import markdown
+    import nh3
+
+    md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS, extension_configs=MARKDOWN_EXTENSION_CONFIGS)
+    cleaner = nh3.Cleaner(
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRS,
+        link_rel=None,
+        url_schemes={'http', 'https', 'mailto'},
+    )
+    return lambda text: cleaner.clean(md.reset().convert(text))
+
+
+def render_existing_lessons(apps, schema_editor):
+    render_content_html = make_renderer()
+
+    Lesson = apps.get_model('courses', 'Lesson')
+    batch = []
+    for lesson in Lesson.objects.only('id', 'content').iterator(chunk_size=200):
+        lesson.content_html = render_content_html(lesson.content)
+        lesson.content_hash = hashlib.sha256(lesson.content.encode('utf-8')).hexdigest()
+        batch.append(lesson)
+        if len(batch) >= 200:
+            Lesson.objects.bulk_update(batch, ['content_html', 'content_hash'])
+            batch = []
+    if batch:
+        Lesson.objects.bulk_update(batch, ['content_html', 'content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_course_focus_keyword_course_meta_description_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(render_existing_lessons, migrations.RunPython.noop),
+    ]
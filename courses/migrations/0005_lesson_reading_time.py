@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-16 07:02
+
+from django.db import migrations, models
+
+
+# Snapshots of blog.models.count_words and estimate_reading_time
+def count_words(text):
+    return len(text.split())
+
+
+def estimate_reading_time(word_count):
+    return max(1, round(word_count / 200))
+
+
+def store_reading_times(apps, schema_editor):
+    Lesson = apps.get_model('courses', 'Lesson')
+    batch = []
+    for lesson in Lesson.objects.only('id', 'content', 'reading_time_override').iterator(chunk_size=200):
+        lesson.reading_time = lesson.reading_time_override or estimate_reading_time(count_words(lesson.content))
+        batch.append(lesson)
+        if len(batch) >= 200:
+            Lesson.objects.bulk_update(batch, ['reading_time'])
+            batch = []
+    if batch:
+        Lesson.objects.bulk_update(batch, ['reading_time'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_lesson_content_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.RunPython(store_reading_times, migrations.RunPython.noop),
+    ]
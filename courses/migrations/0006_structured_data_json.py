@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-16 07:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0005_lesson_reading_time'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='structured_data_json',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='structured_data_json',
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-16 07:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0006_structured_data_json'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['is_published', '-created_at'], name='course_pub_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lesson',
+            index=models.Index(fields=['course', 'is_published', 'order', 'created_at'], name='lesson_course_pub_order_idx'),
+        ),
+    ]
@@ -1,10 +1,21 @@
+from django.core.cache import cache
 from django.db import models
+from django.db.models import OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.text import slugify
 from django.conf import settings
-import markdown
-import bleach
+from blog.models import count_words, estimate_reading_time, render_content_html
+import hashlib
+import json
+
+
+COURSE_LIST_CACHE_KEY = 'courses:list_v1'
+COURSE_LIST_CACHE_TIMEOUT = 300  # seconds
 
 
 class Course(models.Model):
@@ -59,29 +70,74 @@ class Course(models.Model):
     is_published = models.BooleanField(default=False)
     is_free = models.BooleanField(default=False)
     price = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    # JSON-LD for the detail page, rebuilt by saves that change what it reads
+    structured_data_json = models.TextField(blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_published', '-created_at'], name='course_pub_created_idx'),
+        ]
+
+    # Fields read by _build_structured_data()
+    STRUCTURED_DATA_SOURCE_FIELDS = frozenset({
+        'schema_type', 'title', 'seo_title', 'description', 'meta_description',
+        'cover_image', 'og_image_alt', 'focus_keyword', 'meta_keywords', 'is_free', 'price',
+    })
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so save() can tell whether lesson JSON-LD went stale
+        instance._loaded_title = instance.__dict__.get('title')
+        return instance
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if not update_fields.isdisjoint(self.STRUCTURED_DATA_SOURCE_FIELDS):
+                update_fields.add('structured_data_json')
+            kwargs['update_fields'] = update_fields
+        if update_fields is None or 'structured_data_json' in update_fields:
+            # Course JSON-LD has no timestamps, so it is written by this same save
+            self.structured_data_json = self._build_structured_data()
+        title_changed = (
+            not self._state.adding
+            and (update_fields is None or 'title' in update_fields)
+            and self.title != getattr(self, '_loaded_title', None)
+        )
         super().save(*args, **kwargs)
+        self._loaded_title = self.title
+        if title_changed:
+            # Lesson JSON-LD embeds the course title
+            for lesson in self.lessons.defer('content', 'content_html'):
+                lesson.course = self
+                lesson.refresh_structured_data()
 
     def get_absolute_url(self):
         return reverse('courses:course_detail', kwargs={'slug': self.slug})
 
     @property
     def total_lessons(self):
+        # List views annotate the counts to avoid a COUNT per course
+        total_lessons_count = getattr(self, 'total_lessons_count', None)
+        if total_lessons_count is not None:
+            return total_lessons_count
         return self.lessons.count()
 
     @property
     def published_lessons(self):
+        published_lessons_count = getattr(self, 'published_lessons_count', None)
+        if published_lessons_count is not None:
+            return published_lessons_count
         return self.lessons.filter(is_published=True).count()
     
     @property
@@ -99,17 +155,19 @@ class Course(models.Model):
             return self.description[:157] + "..."
         return self.description
     
-    @property
+    @cached_property
     def get_keywords_list(self):
-        """Return keywords as a list."""
+        """Return keywords as a list; templates read it more than once per render."""
         if self.meta_keywords:
-            return [kw.strip() for kw in self.meta_keywords.split(',') if kw.strip()]
+            return [kw for kw in (part.strip() for part in self.meta_keywords.split(',')) if kw]
         return []
     
     def get_structured_data(self):
-        """Generate JSON-LD structured data for the course."""
-        import json
-        
+        """Return JSON-LD structured data for the course."""
+        # Courses not saved since structured_data_json was added are built per render
+        return self.structured_data_json or self._build_structured_data()
+
+    def _build_structured_data(self):
         data = {
             "@context": "https://schema.org",
             "@type": self.schema_type,
@@ -145,7 +203,7 @@ class Course(models.Model):
                 "priceCurrency": "USD"
             }
         
-        return json.dumps(data, indent=2)
+        return json.dumps(data, separators=(',', ':'))
 
 
 class Lesson(models.Model):
@@ -198,11 +256,33 @@ class Lesson(models.Model):
     published_at = models.DateTimeField(blank=True, null=True)
     is_free = models.BooleanField(default=True)
     order = models.PositiveIntegerField(default=0, help_text='Order within a course')
+    # Rendered from content on save; content_hash tracks what was rendered
+    content_html = models.TextField(blank=True, editable=False)
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
+    # Estimated on save (or reading_time_override) so cards don't need the body
+    reading_time = models.PositiveIntegerField(default=1, editable=False)
+    # JSON-LD for the detail page, rebuilt by saves that change what it reads
+    structured_data_json = models.TextField(blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['order', '-published_at', '-created_at']
+        indexes = [
+            # Published lessons of a course in outline order
+            models.Index(
+                fields=['course', 'is_published', 'order', 'created_at'],
+                name='lesson_course_pub_order_idx',
+            ),
+        ]
+
+    # Columns save() recomputes from content
+    CONTENT_DERIVED_FIELDS = ('reading_time', 'content_html', 'content_hash')
+    # Fields read by _build_structured_data()
+    STRUCTURED_DATA_SOURCE_FIELDS = frozenset({
+        'title', 'seo_title', 'excerpt', 'meta_description', 'course', 'published_at',
+        'updated_at', 'cover_image', 'og_image_alt', 'focus_keyword', 'meta_keywords',
+    })
 
     def __str__(self):
         return self.title
@@ -212,18 +292,38 @@ class Lesson(models.Model):
             self.slug = slugify(self.title)
         if self.is_published and not self.published_at:
             self.published_at = timezone.now()
+        # Partial saves that leave content alone skip the render and word count
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            self.refresh_content_html()
+        if update_fields is None or {'content', 'reading_time_override'} & set(update_fields):
+            self.refresh_reading_time()
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if 'content' in update_fields:
+                update_fields.update(self.CONTENT_DERIVED_FIELDS)
+            if 'reading_time_override' in update_fields:
+                update_fields.add('reading_time')
+            kwargs['update_fields'] = update_fields
         super().save(*args, **kwargs)
+        # Built after the save so dateModified matches the stored updated_at
+        if update_fields is None or not update_fields.isdisjoint(self.STRUCTURED_DATA_SOURCE_FIELDS):
+            self.refresh_structured_data()
+
+    def refresh_reading_time(self):
+        """Store the override, or the estimate from the content's word count."""
+        self.reading_time = self.reading_time_override or estimate_reading_time(count_words(self.content))
+
+    def refresh_content_html(self):
+        """Re-render content_html if content changed since it was last rendered."""
+        content_hash = hashlib.sha256(self.content.encode('utf-8')).hexdigest()
+        if content_hash != self.content_hash:
+            self.content_html = render_content_html(self.content)
+            self.content_hash = content_hash
 
     def get_absolute_url(self):
         return reverse('courses:lesson_detail', kwargs={'course_slug': self.course.slug, 'slug': self.slug})
 
-    @property
-    def reading_time(self):
-        if self.reading_time_override:
-            return self.reading_time_override
-        word_count = len(self.content.split())
-        return max(1, round(word_count / 200))
-    
     @property
     def get_seo_title(self):
         """Return SEO title or fallback to main title."""
@@ -234,17 +334,24 @@ class Lesson(models.Model):
         """Return meta description or fallback to excerpt."""
         return self.meta_description or self.excerpt
     
-    @property
+    @cached_property
     def get_keywords_list(self):
-        """Return keywords as a list."""
+        """Return keywords as a list; templates read it more than once per render."""
         if self.meta_keywords:
-            return [kw.strip() for kw in self.meta_keywords.split(',') if kw.strip()]
+            return [kw for kw in (part.strip() for part in self.meta_keywords.split(',')) if kw]
         return []
     
     def get_structured_data(self):
-        """Generate JSON-LD structured data for the lesson."""
-        import json
-        
+        """Return JSON-LD structured data for the lesson."""
+        # Lessons not saved since structured_data_json was added are built per render
+        return self.structured_data_json or self._build_structured_data()
+
+    def refresh_structured_data(self):
+        """Rebuild and store structured_data_json from the saved lesson."""
+        self.structured_data_json = self._build_structured_data()
+        Lesson.objects.filter(pk=self.pk).update(structured_data_json=self.structured_data_json)
+
+    def _build_structured_data(self):
         data = {
             "@context": "https://schema.org",
             "@type": "LearningResource",
@@ -274,45 +381,33 @@ class Lesson(models.Model):
         elif self.meta_keywords:
             data["keywords"] = self.meta_keywords
         
-        return json.dumps(data, indent=2)
+        return json.dumps(data, separators=(',', ':'))
 
     @property
-    def content_html(self):
-        """Convert Markdown content to sanitized HTML."""
-        md = markdown.Markdown(extensions=[
-            'fenced_code',
-            'codehilite',
-            'tables',
-            'toc',
-            'nl2br',
-            'sane_lists',
-        ], extension_configs={
-            'codehilite': {
-                'css_class': 'highlight',
-                'linenums': False,
-                'guess_lang': True,
-            }
-        })
+    def is_paid(self):
+        return not self.is_free
 
-        html = md.convert(self.content)
 
-        allowed_tags = [
-            'p', 'br', 'strong', 'em', 'u', 's', 'blockquote',
-            'ul', 'ol', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
-            'pre', 'code', 'div', 'span', 'a', 'img', 'table',
-            'thead', 'tbody', 'tr', 'th', 'td', 'hr',
-        ]
-        allowed_attrs = {
-            '*': ['class', 'id'],
-            'a': ['href', 'title', 'target', 'rel'],
-            'img': ['src', 'alt', 'title', 'width', 'height'],
-        }
+def annotate_lesson_counts(queryset):
+    """Annotate courses with the counts behind total_lessons/published_lessons."""
+    # Correlated subqueries, since a Count() join would group the course query
+    # and drop Course.Meta.ordering
+    lessons = Lesson.objects.filter(course=OuterRef('pk')).order_by().values('course')
+    lesson_count = lessons.annotate(count=models.Count('pk')).values('count')
+    published_count = lessons.filter(is_published=True).annotate(count=models.Count('pk')).values('count')
+    return queryset.annotate(
+        total_lessons_count=Coalesce(Subquery(lesson_count), 0),
+        published_lessons_count=Coalesce(Subquery(published_count), 0),
+    )
 
-        return bleach.clean(html, tags=allowed_tags, attributes=allowed_attrs, strip=True)
 
-    @property
-    def is_paid(self):
-        return not self.is_free
+def prefetch_published_lessons(lookup='course__lessons'):
+    """Prefetch the published lessons get_continue_lesson() walks, in order."""
+    return Prefetch(
+        lookup,
+        queryset=Lesson.objects.filter(is_published=True).order_by('order', 'created_at'),
+        to_attr='published_lesson_list',
+    )
 
 
 class CourseEnrollment(models.Model):
@@ -347,12 +442,23 @@ class CourseEnrollment(models.Model):
 
     def get_continue_lesson(self):
         """Return the lesson the user should resume from."""
-        lessons = list(self.course.lessons.filter(is_published=True).order_by('order', 'created_at'))
+        # Enrollment lists prefetch these with prefetch_published_lessons()
+        lessons = getattr(self.course, 'published_lesson_list', None)
+        if lessons is None:
+            lessons = list(self.course.lessons.filter(is_published=True).order_by('order', 'created_at'))
         if not lessons:
             return None
 
         # If we have a last seen lesson, try to return it; otherwise start at the first lesson
-        if self.last_lesson and self.last_lesson in lessons:
-            return self.last_lesson
+        for lesson in lessons:
+            if lesson.id == self.last_lesson_id:
+                return lesson
 
         return lessons[0]
+
+
+# Signals to rebuild the cached course list
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=Lesson)
+def invalidate_course_list(sender, **kwargs):
+    cache.delete(COURSE_LIST_CACHE_KEY)
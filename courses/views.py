@@ -1,15 +1,30 @@
+from django.core.cache import cache
+from django.http import Http404
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST
 from django.urls import reverse
 
-from .models import Course, Lesson, CourseEnrollment
+from .models import Course, CourseEnrollment, annotate_lesson_counts, prefetch_published_lessons
+from .models import COURSE_LIST_CACHE_KEY, COURSE_LIST_CACHE_TIMEOUT
+from accounts.models import dashboard_cache_key
 from orders.utils import ensure_course_enrollment, user_has_course_access
 from orders.models import Order
 
 
+# Columns rendered by the course list cards
+COURSE_CARD_FIELDS = ('id', 'title', 'slug', 'description', 'cover_image', 'is_free', 'price')
+
+
 def course_list(request):
-    courses = list(Course.objects.filter(is_published=True))
+    # The course cards are the same for everyone; only enrollment state is per user
+    courses = cache.get_or_set(
+        COURSE_LIST_CACHE_KEY,
+        lambda: list(annotate_lesson_counts(
+            Course.objects.filter(is_published=True).only(*COURSE_CARD_FIELDS)
+        )),
+        COURSE_LIST_CACHE_TIMEOUT,
+    )
 
     enrollment_map = {}
     continue_links = {}
@@ -25,7 +40,8 @@ def course_list(request):
         enrollments = (
             CourseEnrollment.objects
             .filter(user=request.user, course__in=courses)
-            .select_related('course', 'last_lesson')
+            .select_related('course')
+            .prefetch_related(prefetch_published_lessons())
         )
         for enrollment in enrollments:
             enrollment_map[enrollment.course_id] = enrollment
@@ -87,11 +103,25 @@ def course_detail(request, slug):
 
 def lesson_detail(request, course_slug, slug):
     course = get_object_or_404(Course, slug=course_slug, is_published=True)
-    lesson = get_object_or_404(Lesson, course=course, slug=slug, is_published=True)
-    course_lessons = course.lessons.filter(is_published=True).order_by('order', 'created_at')
-
-    is_enrolled = False
-    has_course_access = user_has_course_access(request.user, course)
+    # The outline and previous/next links only need a few columns per lesson
+    course_lessons = course.lessons.filter(is_published=True).order_by('order', 'created_at').only(
+        'id', 'course', 'slug', 'title', 'is_free', 'reading_time'
+    )
+    lesson_list = list(course_lessons)
+    current_index = {item.slug: i for i, item in enumerate(lesson_list)}.get(slug)
+    if current_index is None:
+        raise Http404("No Lesson matches the given query.")
+    lesson = course.lessons.get(pk=lesson_list[current_index].pk)
+    previous_lesson = lesson_list[current_index - 1] if current_index > 0 else None
+    next_lesson = lesson_list[current_index + 1] if current_index < len(lesson_list) - 1 else None
+
+    # One enrollment lookup serves the access check, auto-enroll and resume progress
+    enrollment = None
+    if request.user.is_authenticated:
+        enrollment = CourseEnrollment.objects.filter(
+            user=request.user, course=course
+        ).only('id', 'progress', 'last_lesson').first()
+    has_course_access = enrollment is not None or user_has_course_access(request.user, course)
     
     # SECURITY FIX: Separate lesson access from course enrollment
     # User can access this specific lesson if:
@@ -99,49 +129,30 @@ def lesson_detail(request, course_slug, slug):
     # 2. User has purchased/enrolled in the course
     has_lesson_access = lesson.is_free or has_course_access
     
-    if request.user.is_authenticated:
-        is_enrolled = CourseEnrollment.objects.filter(user=request.user, course=course).exists()
-        
-        # Only auto-enroll if user has COURSE access (not just free lesson access)
-        if not is_enrolled and has_course_access:
-            ensure_course_enrollment(request.user, course)
-            is_enrolled = True
-
-    previous_lesson = None
-    next_lesson = None
-    lesson_list = list(course_lessons)
-    try:
-        current_index = lesson_list.index(lesson)
-        if current_index > 0:
-            previous_lesson = lesson_list[current_index - 1]
-        if current_index < len(lesson_list) - 1:
-            next_lesson = lesson_list[current_index + 1]
-    except ValueError:
-        pass
+    # Only auto-enroll if user has COURSE access (not just free lesson access)
+    if request.user.is_authenticated and enrollment is None and has_course_access:
+        enrollment = ensure_course_enrollment(request.user, course)
+    is_enrolled = enrollment is not None
 
     # Persist resume progress for enrolled users
-    if request.user.is_authenticated and is_enrolled:
-        enrollment = CourseEnrollment.objects.filter(user=request.user, course=course).select_related('last_lesson').first()
-        if enrollment:
-            update_fields = []
-            if enrollment.last_lesson_id != lesson.id:
-                enrollment.last_lesson = lesson
-                update_fields.append('last_lesson')
-
-            total_lessons = len(lesson_list)
-            if total_lessons:
-                progress_pct = int(((current_index + 1) / total_lessons) * 100)
-                if enrollment.progress != progress_pct:
-                    enrollment.progress = progress_pct
-                    update_fields.append('progress')
-
-            if update_fields:
-                enrollment.save(update_fields=update_fields)
+    if enrollment:
+        update_fields = []
+        if enrollment.last_lesson_id != lesson.id:
+            enrollment.last_lesson = lesson
+            update_fields.append('last_lesson')
+
+        progress_pct = int(((current_index + 1) / len(lesson_list)) * 100)
+        if enrollment.progress != progress_pct:
+            enrollment.progress = progress_pct
+            update_fields.append('progress')
+
+        if update_fields:
+            enrollment.save(update_fields=update_fields)
 
     context = {
         'post': lesson,  # keep template variable name aligned with existing lesson template
         'course': course,
-        'course_lessons': course_lessons,
+        'course_lessons': lesson_list,
         'previous_lesson': previous_lesson,
         'next_lesson': next_lesson,
         'has_access': has_lesson_access,  # Access to THIS lesson only
@@ -160,5 +171,11 @@ def enroll_course(request, slug):
         checkout_url = f"{reverse('orders:create_order')}?course={course.slug}"
         return redirect(checkout_url)
 
-    CourseEnrollment.objects.get_or_create(user=request.user, course=course)
+    # A single INSERT that skips an existing enrollment (ON CONFLICT DO NOTHING /
+    # INSERT IGNORE) instead of get_or_create's SELECT, savepoint and INSERT
+    CourseEnrollment.objects.bulk_create(
+        [CourseEnrollment(user=request.user, course=course)], ignore_conflicts=True
+    )
+    # bulk_create sends no post_save, which is what normally clears the dashboard cache
+    cache.delete(dashboard_cache_key(request.user.pk))
     return redirect(course.get_absolute_url())
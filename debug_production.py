@@ -157,6 +157,7 @@ def check_imports():
         'django',
         'markdown',
         'bleach',
+        'nh3',
         'pygments',
         'PIL',  # Pillow for ImageField
     ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-16 06:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_order_coinbase_charge_id_order_coinbase_hosted_url_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', 'post', 'status'], name='orders_orde_user_id_12eab0_idx'),
+        ),
+    ]
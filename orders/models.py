@@ -98,6 +98,7 @@ class Order(models.Model):
             models.Index(fields=['user', '-created_at']),
             models.Index(fields=['status']),
             models.Index(fields=['order_number']),
+            models.Index(fields=['user', 'post', 'status']),
         ]
 
     def __str__(self):
@@ -170,8 +171,8 @@ class Order(models.Model):
             return self.course
         if self.service:
             return self.service
-        # For new orders, get first item's product
-        first_item = self.items.first()
+        # For new orders, get first item's product (items.all() reuses a prefetch)
+        first_item = next(iter(self.items.all()), None)
         return first_item.get_product() if first_item else None
 
     def get_product_label(self):
@@ -179,11 +180,11 @@ class Order(models.Model):
         if product:
             return str(product)
         # For orders with multiple items
-        item_count = self.items.count()
-        if item_count > 1:
-            return f"{item_count} items"
-        elif item_count == 1:
-            return str(self.items.first().get_product())
+        items = self.items.all()
+        if len(items) > 1:
+            return f"{len(items)} items"
+        elif len(items) == 1:
+            return str(items[0].get_product())
         return 'Unknown product'
 
     def get_product_type_for_target(self):
@@ -1,31 +1,30 @@
 from __future__ import annotations
 
 from typing import Optional
-from .models import Order
+from django.db.models import Exists, OuterRef, Q
+from .models import Order, OrderItem
 from courses.models import CourseEnrollment, Course
 from blog.models import Post
 from services.models import Service
 
 
+def _has_paid_order(user, product_type: str, product) -> bool:
+    """Check legacy orders and the OrderItem structure in a single EXISTS query."""
+    # A correlated EXISTS on the items avoids joining every item row of every paid order
+    has_item = Exists(OrderItem.objects.filter(order=OuterRef('pk'), **{product_type: product}))
+    return Order.objects.filter(
+        Q(**{product_type: product}) | has_item,
+        user=user,
+        status=Order.STATUS_PAID,
+    ).exists()
+
+
 def user_has_post_access(user, post: Post) -> bool:
     if post.is_free:
         return True
     if not user.is_authenticated:
         return False
-    
-    # Check both legacy orders and new OrderItem structure
-    legacy_access = Order.objects.filter(user=user, post=post, status=Order.STATUS_PAID).exists()
-    if legacy_access:
-        return True
-    
-    # Check new OrderItem structure
-    new_access = Order.objects.filter(
-        user=user,
-        status=Order.STATUS_PAID,
-        items__post=post
-    ).exists()
-    
-    return new_access
+    return _has_paid_order(user, 'post', post)
 
 
 def user_has_course_access(user, course: Course) -> bool:
@@ -35,39 +34,13 @@ def user_has_course_access(user, course: Course) -> bool:
         return False
     if CourseEnrollment.objects.filter(user=user, course=course).exists():
         return True
-    
-    # Check both legacy orders and new OrderItem structure
-    legacy_access = Order.objects.filter(user=user, course=course, status=Order.STATUS_PAID).exists()
-    if legacy_access:
-        return True
-    
-    # Check new OrderItem structure
-    new_access = Order.objects.filter(
-        user=user,
-        status=Order.STATUS_PAID,
-        items__course=course
-    ).exists()
-    
-    return new_access
+    return _has_paid_order(user, 'course', course)
 
 
 def user_has_service_order(user, service: Service) -> bool:
     if not user.is_authenticated:
         return False
-    
-    # Check both legacy orders and new OrderItem structure
-    legacy_access = Order.objects.filter(user=user, service=service, status=Order.STATUS_PAID).exists()
-    if legacy_access:
-        return True
-    
-    # Check new OrderItem structure
-    new_access = Order.objects.filter(
-        user=user,
-        status=Order.STATUS_PAID,
-        items__service=service
-    ).exists()
-    
-    return new_access
+    return _has_paid_order(user, 'service', service)
 
 
 def ensure_course_enrollment(user, course: Course) -> CourseEnrollment:
@@ -1,8 +1,6 @@
 from django.db import models
 from django.utils.text import slugify
 from django.urls import reverse
-import markdown
-import bleach
 
 
 class ServiceCategory(models.Model):
@@ -112,6 +110,9 @@ class Service(models.Model):
         if not self.description:
             return ""
         
+        import bleach
+        import markdown
+        
         # Configure markdown with extensions
         md = markdown.Markdown(extensions=[
             'fenced_code',